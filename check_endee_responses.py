@@ -1,19 +1,26 @@
 """Check what Endee endpoints actually return."""
 
-import urllib.request
-import json
+import httpx
+
+# Shared client so every probe reuses the same keep-alive connection
+_http = httpx.Client(
+    timeout=5.0,
+    follow_redirects=True,  # urllib followed redirects, httpx doesn't by default
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+)
 
 def get_endpoint_response(url):
     """Get response from an endpoint."""
     try:
-        with urllib.request.urlopen(url, timeout=5) as response:
-            content = response.read().decode()
-            print(f"📡 {url}")
-            print(f"   Status: {response.status}")
-            print(f"   Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
-            print(f"   Content: {content[:200]}{'...' if len(content) > 200 else ''}")
-            print()
-            return content
+        response = _http.get(url)
+        response.raise_for_status()
+        content = response.text
+        print(f"📡 {url}")
+        print(f"   Status: {response.status_code}")
+        print(f"   Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
+        print(f"   Content: {content[:200]}{'...' if len(content) > 200 else ''}")
+        print()
+        return content
     except Exception as e:
         print(f"❌ {url}: {e}")
         return None
@@ -1,53 +1,49 @@
 """Discover Endee API endpoints by testing common paths."""
 
-import urllib.request
+import asyncio
 import json
+import sys
+import httpx
 
-def test_endpoint(base_url, path, method="GET", data=None):
-    """Test an API endpoint."""
+def encode_json(data):
+    """Encode a request body as compact UTF-8 JSON."""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+async def test_endpoint(client, base_url, path, method="GET", data=None):
+    """Test an API endpoint. `data` may be a dict or an already-encoded JSON body."""
     url = f"{base_url}{path}"
     
+    if data and not isinstance(data, bytes):
+        data = encode_json(data)
+    headers = {'Content-Type': 'application/json'} if data else None
+    
     try:
-        if method == "GET":
-            with urllib.request.urlopen(url, timeout=5) as response:
-                status = response.status
-                try:
-                    content = response.read().decode()
-                    if content:
-                        try:
-                            parsed = json.loads(content)
-                            return status, parsed
-                        except:
-                            return status, content
-                    else:
-                        return status, "Empty response"
-                except:
-                    return status, "Could not read response"
-        else:
-            # For POST requests
-            req_data = json.dumps(data).encode('utf-8') if data else None
-            req = urllib.request.Request(
-                url, 
-                data=req_data,
-                headers={'Content-Type': 'application/json'} if req_data else {}
-            )
-            req.get_method = lambda: method
-            
-            with urllib.request.urlopen(req, timeout=5) as response:
-                status = response.status
-                content = response.read().decode()
-                try:
-                    parsed = json.loads(content)
-                    return status, parsed
-                except:
-                    return status, content
+        response = await client.request(
+            method, url, content=data, headers=headers, timeout=5.0
+        )
+        status = response.status_code
+        
+        if status >= 400:
+            return status, f"HTTP Error: {response.reason_phrase}"
+        
+        raw = response.content
+        if not raw:
+            return status, "Empty response"
+        
+        # Only attempt a JSON parse when the server says it sent JSON;
+        # most probes come back as HTML and would just fail to parse
+        if 'json' in response.headers.get('Content-Type', ''):
+            try:
+                return status, json.loads(raw)
+            except ValueError:
+                pass
+        
+        return status, raw.decode(errors="replace")
                     
-    except urllib.error.HTTPError as e:
-        return e.code, f"HTTP Error: {e.reason}"
     except Exception as e:
         return None, f"Error: {e}"
 
-def discover_api():
+async def discover_api():
     """Discover Endee API endpoints."""
     base_url = "http://localhost:8080"
     
@@ -76,36 +72,44 @@ def discover_api():
     
     working_endpoints = []
     
-    for path in test_paths:
-        print(f"Testing {path}...", end=" ")
-        status, response = test_endpoint(base_url, path)
+    # All probes are independent, so fire them together and let the
+    # slowest one (not the sum of all of them) bound the wall time
+    limits = httpx.Limits(max_connections=64)
+    async with httpx.AsyncClient(limits=limits) as client:
+        results = await asyncio.gather(
+            *[test_endpoint(client, base_url, path) for path in test_paths]
+        )
         
-        if status and status < 400:
-            print(f"✅ {status}")
-            working_endpoints.append((path, status, response))
-            if isinstance(response, dict) or (isinstance(response, str) and len(response) < 200):
-                print(f"   Response: {response}")
-        elif status == 404:
-            print(f"❌ 404")
-        elif status == 405:
-            print(f"⚠️  405 (Method not allowed - might need POST)")
-        else:
-            print(f"❌ {status}: {response}")
-    
-    print(f"\n📋 Working Endpoints ({len(working_endpoints)}):")
-    for path, status, response in working_endpoints:
-        print(f"   {path} -> {status}")
-    
-    # Test POST on promising endpoints
-    print(f"\n🔄 Testing POST methods on promising endpoints...")
-    
-    post_candidates = ["/collections", "/indexes", "/api/collections", "/v1/collections"]
-    
-    for path in post_candidates:
-        if any(p[0] == path for p in working_endpoints):
-            continue  # Skip if GET already worked
-            
-        print(f"Testing POST {path}...", end=" ")
+        # Buffer each phase's output and write it in one go
+        lines = []
+        for path, (status, response) in zip(test_paths, results):
+            if status and status < 400:
+                lines.append(f"Testing {path}... ✅ {status}")
+                working_endpoints.append((path, status, response))
+                if type(response) is dict or (type(response) is str and len(response) < 200):
+                    lines.append(f"   Response: {response}")
+            elif status == 404:
+                lines.append(f"Testing {path}... ❌ 404")
+            elif status == 405:
+                lines.append(f"Testing {path}... ⚠️  405 (Method not allowed - might need POST)")
+            else:
+                lines.append(f"Testing {path}... ❌ {status}: {response}")
+        
+        lines.append(f"\n📋 Working Endpoints ({len(working_endpoints)}):")
+        for path, status, response in working_endpoints:
+            lines.append(f"   {path} -> {status}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        
+        # Test POST on promising endpoints
+        print(f"\n🔄 Testing POST methods on promising endpoints...")
+        
+        post_candidates = ["/collections", "/indexes", "/api/collections", "/v1/collections"]
+        
+        # Skip candidates where GET already worked
+        post_paths = [
+            path for path in post_candidates
+            if not any(p[0] == path for p in working_endpoints)
+        ]
         
         # Try creating a test collection
         test_data = {
@@ -114,17 +118,25 @@ def discover_api():
             "metric": "cosine"
         }
         
-        status, response = test_endpoint(base_url, path, "POST", test_data)
-        
+        # Every candidate gets the same body, so encode it only once
+        body = encode_json(test_data)
+        results = await asyncio.gather(
+            *[test_endpoint(client, base_url, path, "POST", body) for path in post_paths]
+        )
+    
+    lines = []
+    for path, (status, response) in zip(post_paths, results):
         if status and status < 400:
-            print(f"✅ {status}")
-            print(f"   Response: {response}")
+            lines.append(f"Testing POST {path}... ✅ {status}")
+            lines.append(f"   Response: {response}")
         elif status == 404:
-            print(f"❌ 404")
+            lines.append(f"Testing POST {path}... ❌ 404")
         elif status == 405:
-            print(f"❌ 405")
+            lines.append(f"Testing POST {path}... ❌ 405")
         else:
-            print(f"❌ {status}: {response}")
+            lines.append(f"Testing POST {path}... ❌ {status}: {response}")
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
-    discover_api()
\ No newline at end of file
+    asyncio.run(discover_api())
\ No newline at end of file
@@ -1,32 +1,79 @@
 """Find the actual Endee API endpoints."""
 
-import urllib.request
+import asyncio
 import json
+import sys
+import httpx
+
+# Shared client so the probes against the same host reuse one
+# keep-alive connection instead of opening a socket per request
+_http = httpx.Client(
+    timeout=5.0,
+    follow_redirects=True,  # urllib followed redirects, httpx doesn't by default
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+)
+
+# Common API prefixes
+API_PREFIXES = (
+    "/api",
+    "/api/v1",
+    "/v1",
+    "/rest",
+    "/rest/v1"
+)
+
+# Common endpoints
+ENDPOINTS = (
+    "/health",
+    "/collections",
+    "/indexes",
+    "/vectors",
+    "/search"
+)
+
+# Returned by test_api_path when a path serves an HTML page
+HTML_PAGE = "HTML page"
 
 def test_api_path(base_url, path):
     """Test if a path returns JSON (API) instead of HTML."""
     url = f"{base_url}{path}"
     try:
-        with urllib.request.urlopen(url, timeout=5) as response:
-            content_type = response.headers.get('Content-Type', '')
-            content = response.read().decode()
-            
-            # Check if it's JSON
-            if 'application/json' in content_type or content.strip().startswith('{'):
-                try:
-                    parsed = json.loads(content)
-                    return True, parsed
-                except:
-                    pass
-            
-            # Check if it's not HTML
-            if not content.strip().startswith('<!doctype html>') and not content.strip().startswith('<html'):
-                return True, content
-                
-        return False, None
+        response = _http.get(url)
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        raw = response.content
+        head = raw[:64].lstrip().lower()
+        
+        # Check if it's JSON
+        if 'application/json' in content_type or head.startswith(b'{'):
+            try:
+                parsed = json.loads(raw)
+                return True, parsed
+            except:
+                pass
+        
+        # Check for HTML on the raw bytes so HTML pages are never decoded
+        if head.startswith(b'<!doctype html') or head.startswith(b'<html'):
+            return False, HTML_PAGE
+        
+        return True, raw.decode(errors='replace')
     except Exception as e:
         return False, str(e)
 
+async def probe_port(client, port):
+    """Probe a port's health endpoint, returning its Content-Type if it responds."""
+    try:
+        response = await client.get(f"http://localhost:{port}/health")
+        response.raise_for_status()
+        return port, response.headers.get('Content-Type', '')
+    except Exception:
+        return port, None
+
+async def probe_ports(ports):
+    """Probe several ports concurrently."""
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        return await asyncio.gather(*[probe_port(client, port) for port in ports])
+
 def main():
     """Find Endee API endpoints."""
     base_url = "http://localhost:8080"
@@ -34,83 +81,74 @@ def main():
     print("🔍 Finding Endee API Endpoints")
     print("=" * 50)
     
-    # Try common API prefixes
-    api_prefixes = [
-        "/api",
-        "/api/v1", 
-        "/v1",
-        "/rest",
-        "/rest/v1"
-    ]
-    
-    # Try common endpoints
-    endpoints = [
-        "/health",
-        "/collections",
-        "/indexes", 
-        "/vectors",
-        "/search"
-    ]
-    
     found_apis = []
     
-    # Test root API paths
-    for prefix in api_prefixes:
-        print(f"\n🔍 Testing prefix: {prefix}")
+    # Test root API paths; each phase's output is buffered and written once
+    for prefix in API_PREFIXES:
+        lines = [f"\n🔍 Testing prefix: {prefix}"]
         
         is_api, response = test_api_path(base_url, prefix)
         if is_api:
-            print(f"   ✅ {prefix} -> API response")
+            lines.append(f"   ✅ {prefix} -> API response")
             found_apis.append(prefix)
-            if isinstance(response, dict):
-                print(f"      {response}")
+            if type(response) is dict:
+                lines.append(f"      {response}")
         else:
-            print(f"   ❌ {prefix} -> HTML/Error")
+            lines.append(f"   ❌ {prefix} -> HTML/Error")
+        
+        # A prefix serving HTML at its root is usually a UI catch-all.
+        # If its first endpoint is HTML as well, skip the remaining ones.
+        root_is_html = response == HTML_PAGE
         
         # Test endpoints under this prefix
-        for endpoint in endpoints:
+        for i, endpoint in enumerate(ENDPOINTS):
             full_path = f"{prefix}{endpoint}"
             is_api, response = test_api_path(base_url, full_path)
             if is_api:
-                print(f"   ✅ {full_path} -> API response")
+                lines.append(f"   ✅ {full_path} -> API response")
                 found_apis.append(full_path)
-                if isinstance(response, dict):
-                    print(f"      {response}")
+                if type(response) is dict:
+                    lines.append(f"      {response}")
+            elif root_is_html and i == 0 and response == HTML_PAGE:
+                lines.append(f"   ⏭️  {prefix} serves HTML, skipping its endpoints")
+                break
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Also test direct endpoints (no prefix)
-    print(f"\n🔍 Testing direct endpoints:")
-    for endpoint in endpoints:
+    lines = [f"\n🔍 Testing direct endpoints:"]
+    for endpoint in ENDPOINTS:
         is_api, response = test_api_path(base_url, endpoint)
         if is_api:
-            print(f"   ✅ {endpoint} -> API response")
+            lines.append(f"   ✅ {endpoint} -> API response")
             found_apis.append(endpoint)
-            if isinstance(response, dict):
-                print(f"      {response}")
+            if type(response) is dict:
+                lines.append(f"      {response}")
         else:
-            print(f"   ❌ {endpoint} -> HTML/Error")
+            lines.append(f"   ❌ {endpoint} -> HTML/Error")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     # Try different ports
-    print(f"\n🔍 Testing different ports:")
-    for port in [8081, 8082, 9000, 3000]:
-        test_url = f"http://localhost:{port}"
-        try:
-            with urllib.request.urlopen(f"{test_url}/health", timeout=2) as response:
-                content_type = response.headers.get('Content-Type', '')
-                if 'application/json' in content_type:
-                    print(f"   ✅ Port {port} has JSON API")
-                else:
-                    print(f"   ⚠️  Port {port} responds but not JSON")
-        except:
-            print(f"   ❌ Port {port} not accessible")
+    lines = [f"\n🔍 Testing different ports:"]
+    # Unreachable ports each wait out the timeout, so probe them all at once
+    for port, content_type in asyncio.run(probe_ports([8081, 8082, 9000, 3000])):
+        if content_type is None:
+            lines.append(f"   ❌ Port {port} not accessible")
+        elif 'application/json' in content_type:
+            lines.append(f"   ✅ Port {port} has JSON API")
+        else:
+            lines.append(f"   ⚠️  Port {port} responds but not JSON")
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    print(f"\n📋 Summary:")
+    lines = [f"\n📋 Summary:"]
     if found_apis:
-        print(f"Found {len(found_apis)} API endpoints:")
+        lines.append(f"Found {len(found_apis)} API endpoints:")
         for api in found_apis:
-            print(f"   {base_url}{api}")
+            lines.append(f"   {base_url}{api}")
     else:
-        print("❌ No JSON API endpoints found")
-        print("💡 Endee might be running in UI-only mode or use a different API structure")
+        lines.append("❌ No JSON API endpoints found")
+        lines.append("💡 Endee might be running in UI-only mode or use a different API structure")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
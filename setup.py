@@ -3,19 +3,38 @@
 import subprocess
 import sys
 import os
+from collections import deque
 from pathlib import Path
 
 def run_command(command, description):
-    """Run a command and handle errors."""
+    """Run a command, streaming its output, and handle errors."""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
+        process = subprocess.Popen(
+            command, shell=True, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+    except OSError as e:
         print(f"❌ {description} failed:")
-        print(f"   Error: {e.stderr}")
+        print(f"   Error: {e}")
         return False
+    
+    # Stream output as it arrives instead of buffering all of it in memory;
+    # keep only the tail around for the error report
+    recent_lines = deque(maxlen=20)
+    for line in process.stdout:
+        line = line.rstrip()
+        print(f"   {line}")
+        recent_lines.append(line)
+    process.stdout.close()
+    
+    if process.wait() != 0:
+        print(f"❌ {description} failed:")
+        print("   Error: " + "\n   ".join(recent_lines))
+        return False
+    
+    print(f"✅ {description} completed successfully")
+    return True
 
 def main():
     """Main setup function."""
@@ -13,7 +13,8 @@ def test_imports():
     print("=" * 40)
     
     try:
-        from config import settings
+        from config import get_settings
+        settings = get_settings()
         print("✅ Config module imported")
         print(f"   Endee URL: {settings.endee_url}")
         print(f"   OpenAI Model: {settings.openai_model}")
@@ -125,19 +126,22 @@ def test_system_status():
         print("   Start with: docker-compose up endee")
     
     # Check environment file
-    env_file = Path(".env")
-    if env_file.exists():
+    # Read .env once and run every check against that copy
+    try:
+        env_content = Path(".env").read_text()
+    except FileNotFoundError:
+        env_content = None
+    
+    if env_content is not None:
         print("✅ .env file exists")
         
         # Check for API key
-        with open(".env", "r") as f:
-            content = f.read()
-            if "OPENAI_API_KEY=your-openai-api-key-here" in content:
-                print("⚠️  OpenAI API key not set (using placeholder)")
-            elif "OPENAI_API_KEY=" in content:
-                print("✅ OpenAI API key configured")
-            else:
-                print("❌ OpenAI API key not found in .env")
+        if "OPENAI_API_KEY=your-openai-api-key-here" in env_content:
+            print("⚠️  OpenAI API key not set (using placeholder)")
+        elif "OPENAI_API_KEY=" in env_content:
+            print("✅ OpenAI API key configured")
+        else:
+            print("❌ OpenAI API key not found in .env")
     else:
         print("❌ .env file not found")
     
@@ -1,6 +1,7 @@
 """Configuration settings for the RAG system."""
 
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 
@@ -11,10 +12,28 @@ class Settings(BaseSettings):
     # Endee Configuration
     endee_url: str = "http://localhost:8080"
     endee_auth_token: Optional[str] = None
+    endee_use_msgpack: bool = False  # needs msgspec and server support
+    endee_binary_vectors: bool = False  # float32 buffers, needs server support
+    endee_compress_requests: bool = False  # needs server Content-Encoding support
+    endee_compression: str = "gzip"  # gzip or zstd (needs zstandard)
+    endee_http2: bool = True  # used for https URLs when h2 is installed
+    endee_wire_quantization: str = "fp32"  # fp32 or int8, needs server support
     
     # OpenAI Configuration
     openai_api_key: str = "your-openai-api-key-here"
     openai_model: str = "text-embedding-3-small"
+    embedding_quantization: str = "fp16"  # fp32, fp16 or int8
+    
+    # Embedding Cache
+    embedding_cache_size: int = 4096
+    embedding_cache_ttl: int = 3600
+    redis_url: Optional[str] = None
+    embedding_cache_path: Optional[str] = ".embed_cache.sqlite"  # empty to disable
+    
+    # Search results are reused for queries at least this similar (cosine).
+    # Off by default: similar wordings can still ask different questions
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_size: int = 0  # 0 to disable
     
     # Document Processing
     chunk_size: int = 512
@@ -29,9 +48,13 @@ class Settings(BaseSettings):
         extra = "ignore"  # Ignore extra fields from .env
 
 
-# Global settings instance
-def get_settings():
-    """Get settings instance with error handling."""
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the shared settings instance, loading .env on first use only.
+    
+    Call get_settings.cache_clear() to reload (e.g. in tests).
+    """
     try:
         return Settings()
     except Exception as e:
@@ -41,5 +64,3 @@ def get_settings():
             openai_api_key="your-openai-api-key-here",
             endee_url="http://localhost:8080"
         )
-
-settings = get_settings()
\ No newline at end of file
@@ -1,7 +1,12 @@
 """Document processing utilities for PDF text extraction and chunking."""
 
 import logging
-from typing import List, Dict, Any
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 import PyPDF2
 import pdfplumber
@@ -9,13 +14,72 @@ from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
+# Sentence terminators and whitespace runs, compiled once at import
+_SENT_RE = re.compile(r'[.!?]+')
+_WS_RE = re.compile(r'\s+')
+
+
+def _iter_pages(pages, first_page_num: int = 1) -> Iterator[Dict[str, Any]]:
+    """Lazily extract stripped text from a sequence of pdfplumber or PyPDF2 pages."""
+    for page_num, page in enumerate(pages, first_page_num):
+        try:
+            page_text = page.extract_text()
+            if page_text:
+                yield {
+                    "page": page_num,
+                    "text": page_text.strip()
+                }
+        except Exception as e:
+            logger.warning(f"Failed to extract page {page_num}: {e}")
+            continue
+        finally:
+            # Drop pdfplumber's per-page layout cache once the page is done
+            if hasattr(page, "close"):
+                page.close()
+
+
+def _iter_page_range(source, method: str, start: int, stop: int) -> Iterator[Dict[str, Any]]:
+    """Lazily extract pages [start, stop) of a PDF given as a path, bytes or stream."""
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+    
+    if method == "pdfplumber":
+        with pdfplumber.open(source) as pdf:
+            yield from _iter_pages(pdf.pages[start:stop], start + 1)
+    else:
+        pdf_reader = PyPDF2.PdfReader(source)
+        yield from _iter_pages((pdf_reader.pages[i] for i in range(start, stop)), start + 1)
+
+
+def _extract_page_range(path: str, method: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """
+    Extract pages [start, stop) of a PDF file.
+    
+    Runs in a worker process, so it opens its own copy of the document.
+    """
+    return list(_iter_page_range(path, method, start, stop))
+
+
+def _count_pages(source, method: str) -> int:
+    """Open a PDF with the given extraction library and count its pages."""
+    if method == "pdfplumber":
+        with pdfplumber.open(source) as pdf:
+            return len(pdf.pages)
+    return len(PyPDF2.PdfReader(source).pages)
+
 
 class DocumentProcessor:
     """Handles PDF text extraction and document chunking."""
     
-    def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50):
+    # Documents shorter than this are extracted serially; for them the cost
+    # of starting worker processes outweighs the parallel speedup
+    PARALLEL_MIN_PAGES = 32
+    
+    def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50,
+                 max_workers: Optional[int] = None):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
     
     def extract_text_from_pdf(self, file_path: str) -> Dict[str, Any]:
         """
@@ -27,155 +91,143 @@ class DocumentProcessor:
         Returns:
             Dictionary containing extracted text and metadata
         """
-        try:
-            # Try pdfplumber first (better for complex layouts)
-            return self._extract_with_pdfplumber(file_path)
-        except Exception as e:
-            logger.warning(f"pdfplumber failed, trying PyPDF2: {e}")
-            try:
-                return self._extract_with_pypdf2(file_path)
-            except Exception as e2:
-                logger.error(f"Both PDF extraction methods failed: {e2}")
-                raise ValueError(f"Could not extract text from PDF: {e2}")
+        return self._extract_document(file_path, {})
     
-    def _extract_with_pdfplumber(self, file_path: str) -> Dict[str, Any]:
-        """Extract text using pdfplumber (preserves layout better)."""
-        text_content = []
-        metadata = {
-            "source": Path(file_path).name,
-            "total_pages": 0,
-            "extraction_method": "pdfplumber"
-        }
+    def _use_parallel(self, total_pages: int, path: Optional[str]) -> bool:
+        """
+        Whether to extract a document's pages in parallel.
         
-        with pdfplumber.open(file_path) as pdf:
-            metadata["total_pages"] = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append({
-                            "page": page_num,
-                            "text": page_text.strip()
-                        })
-                except Exception as e:
-                    logger.warning(f"Failed to extract page {page_num}: {e}")
-                    continue
+        Only files on disk are: workers open the file by path, whereas
+        in-memory content would have to be copied to every worker.
+        """
+        return path is not None and self._process_limit() > 1 and total_pages >= self.PARALLEL_MIN_PAGES
+    
+    def _process_limit(self) -> int:
+        """Most worker processes to use: max_workers, capped at the CPU count."""
+        return min(self.max_workers, os.cpu_count() or 1)
+    
+    @staticmethod
+    def _source_path(source) -> Optional[str]:
+        """The file path of a PDF source (a path or an open file), if it has one."""
+        if isinstance(source, (str, Path)):
+            return str(source)
+        name = getattr(source, "name", None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return name
+        return None
+    
+    def _iter_parallel(self, path: str, method: str, total_pages: int) -> Iterator[Dict[str, Any]]:
+        """
+        Extract pages in worker processes, each handling a contiguous page range.
         
-        return {
-            "content": text_content,
-            "metadata": metadata
-        }
+        Processes are used rather than threads because both extractors are
+        mostly pure Python and their document objects aren't thread-safe;
+        every worker opens its own copy of the PDF from `path`. Workers are
+        spawned rather than forked, since forking while other threads (such
+        as EndeeClient's event loop) hold locks can deadlock the child.
+        """
+        workers = min(self._process_limit(), total_pages)
+        step = -(-total_pages // workers)  # ceiling division
+        ranges = [(start, min(start + step, total_pages)) for start in range(0, total_pages, step)]
+        
+        logger.info(f"Extracting {total_pages} pages with {len(ranges)} worker processes")
+        
+        with ProcessPoolExecutor(max_workers=len(ranges),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = executor.map(
+                _extract_page_range,
+                [path] * len(ranges),
+                [method] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges]
+            )
+            
+            # Ranges are returned in submission order, so pages stay in order
+            for page_range in results:
+                yield from page_range
     
-    def _extract_with_pypdf2(self, file_path: str) -> Dict[str, Any]:
-        """Extract text using PyPDF2 (fallback method)."""
-        text_content = []
-        metadata = {
-            "source": Path(file_path).name,
-            "total_pages": 0,
-            "extraction_method": "PyPDF2"
-        }
+    def iter_pages(self, source, metadata: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily yield (page_num, text) for each page of a PDF that has text.
         
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            metadata["total_pages"] = len(pdf_reader.pages)
+        Only the page being extracted is held in memory, so long documents
+        can be chunked and embedded as they are read.
+        
+        Args:
+            source: Path to the PDF file, or its content as bytes or a
+                readable buffer (e.g. a read-only mmap)
+            metadata: Optional dict that is filled in with source,
+                total_pages and extraction_method once the PDF is opened
             
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append({
-                            "page": page_num,
-                            "text": page_text.strip()
-                        })
-                except Exception as e:
-                    logger.warning(f"Failed to extract page {page_num}: {e}")
-                    continue
+        Yields:
+            Tuples of (page number, page text)
+        """
+        metadata = {} if metadata is None else metadata
         
-        return {
-            "content": text_content,
-            "metadata": metadata
-        }
+        if isinstance(source, (str, Path)):
+            metadata["source"] = Path(source).name
+            open_source = str(source)
+        else:
+            metadata.setdefault("source", "document.pdf")
+            open_source = self._as_stream(source)
+        
+        # Try pdfplumber first (better for complex layouts), then PyPDF2
+        errors = []
+        for method in ("pdfplumber", "PyPDF2"):
+            try:
+                total_pages = _count_pages(open_source, method)
+                break
+            except Exception as e:
+                logger.warning(f"{method} could not open PDF: {e}")
+                errors.append(e)
+                if hasattr(open_source, "seek"):
+                    open_source.seek(0)
+        else:
+            raise ValueError(f"Could not extract text from PDF: {errors[-1]}")
+        
+        metadata["total_pages"] = total_pages
+        metadata["extraction_method"] = method
+        
+        path = self._source_path(source)
+        if self._use_parallel(total_pages, path):
+            pages = self._iter_parallel(path, method, total_pages)
+        else:
+            if hasattr(open_source, "seek"):
+                open_source.seek(0)
+            pages = _iter_page_range(open_source, method, 0, total_pages)
+        
+        for page in pages:
+            yield page["page"], page["text"]
     
     def extract_text_from_bytes(self, pdf_bytes: bytes, filename: str) -> Dict[str, Any]:
         """
         Extract text from PDF bytes (for uploaded files).
         
         Args:
-            pdf_bytes: PDF file content as bytes
+            pdf_bytes: PDF file content as bytes, or a readable buffer such
+                as a read-only mmap (used directly, without copying)
             filename: Original filename for metadata
             
         Returns:
             Dictionary containing extracted text and metadata
         """
-        try:
-            # Try pdfplumber first
-            return self._extract_bytes_with_pdfplumber(pdf_bytes, filename)
-        except Exception as e:
-            logger.warning(f"pdfplumber failed on bytes, trying PyPDF2: {e}")
-            try:
-                return self._extract_bytes_with_pypdf2(pdf_bytes, filename)
-            except Exception as e2:
-                logger.error(f"Both PDF extraction methods failed on bytes: {e2}")
-                raise ValueError(f"Could not extract text from PDF bytes: {e2}")
+        return self._extract_document(pdf_bytes, {"source": filename})
     
-    def _extract_bytes_with_pdfplumber(self, pdf_bytes: bytes, filename: str) -> Dict[str, Any]:
-        """Extract text from bytes using pdfplumber."""
-        text_content = []
-        metadata = {
-            "source": filename,
-            "total_pages": 0,
-            "extraction_method": "pdfplumber"
-        }
-        
-        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-            metadata["total_pages"] = len(pdf.pages)
-            
-            for page_num, page in enumerate(pdf.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append({
-                            "page": page_num,
-                            "text": page_text.strip()
-                        })
-                except Exception as e:
-                    logger.warning(f"Failed to extract page {page_num}: {e}")
-                    continue
-        
+    def _extract_document(self, source, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract every page of a PDF at once, through iter_pages."""
+        content = [{"page": page_num, "text": text}
+                   for page_num, text in self.iter_pages(source, metadata)]
         return {
-            "content": text_content,
+            "content": content,
             "metadata": metadata
         }
     
-    def _extract_bytes_with_pypdf2(self, pdf_bytes: bytes, filename: str) -> Dict[str, Any]:
-        """Extract text from bytes using PyPDF2."""
-        text_content = []
-        metadata = {
-            "source": filename,
-            "total_pages": 0,
-            "extraction_method": "PyPDF2"
-        }
-        
-        pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
-        metadata["total_pages"] = len(pdf_reader.pages)
-        
-        for page_num, page in enumerate(pdf_reader.pages, 1):
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append({
-                        "page": page_num,
-                        "text": page_text.strip()
-                    })
-            except Exception as e:
-                logger.warning(f"Failed to extract page {page_num}: {e}")
-                continue
-        
-        return {
-            "content": text_content,
-            "metadata": metadata
-        }
+    def _as_stream(self, pdf_bytes: bytes):
+        """Wrap PDF content in a seekable stream, reusing file-like buffers as-is."""
+        if hasattr(pdf_bytes, "read") and hasattr(pdf_bytes, "seek"):
+            pdf_bytes.seek(0)
+            return pdf_bytes
+        return BytesIO(pdf_bytes)
     
     def split_text_into_chunks(self, document_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -187,74 +239,81 @@ class DocumentProcessor:
         Returns:
             List of text chunks with metadata
         """
-        chunks = []
-        chunk_id = 0
+        pages = ((page_data["page"], page_data["text"]) for page_data in document_data["content"])
+        chunks = list(self.iter_chunks(pages, document_data["metadata"]))
+        
+        logger.info(f"Split document into {len(chunks)} chunks")
+        return chunks
+    
+    def iter_chunks(self, pages: Iterable[Tuple[int, str]],
+                    doc_metadata: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily split pages into overlapping chunks.
         
-        for page_data in document_data["content"]:
-            page_text = page_data["text"]
-            page_num = page_data["page"]
+        Args:
+            pages: Iterable of (page number, page text), e.g. from iter_pages
+            doc_metadata: Document metadata with source and extraction_method
+                (read as each chunk is created, so it may be filled lazily)
             
+        Yields:
+            Text chunks with metadata
+        """
+        chunk_id = 0
+        
+        for page_num, page_text in pages:
             # Split page text into sentences for better chunking
             sentences = self._split_into_sentences(page_text)
             
-            current_chunk = ""
-            current_sentences = []
+            # (sentence, word count) pairs in the current chunk and their
+            # running word count; chunk text is only joined once, when the
+            # chunk is emitted
+            current_sentences = deque()
+            current_word_count = 0
             
             for sentence in sentences:
-                # Check if adding this sentence would exceed chunk size
-                test_chunk = current_chunk + " " + sentence if current_chunk else sentence
+                sentence_word_count = len(sentence.split())
                 
-                if len(test_chunk.split()) <= self.chunk_size:
-                    current_chunk = test_chunk
-                    current_sentences.append(sentence)
-                else:
-                    # Save current chunk if it has content
-                    if current_chunk:
-                        chunks.append(self._create_chunk(
-                            chunk_id, current_chunk, page_num, 
-                            document_data["metadata"], current_sentences
-                        ))
-                        chunk_id += 1
+                # Check if adding this sentence would exceed chunk size
+                if current_sentences and current_word_count + sentence_word_count > self.chunk_size:
+                    yield self._create_chunk(
+                        chunk_id, " ".join(text for text, _ in current_sentences), page_num, 
+                        doc_metadata, len(current_sentences), current_word_count
+                    )
+                    chunk_id += 1
                     
-                    # Start new chunk with overlap
-                    if self.chunk_overlap > 0 and current_sentences:
-                        overlap_sentences = current_sentences[-self.chunk_overlap:]
-                        current_chunk = " ".join(overlap_sentences) + " " + sentence
-                        current_sentences = overlap_sentences + [sentence]
-                    else:
-                        current_chunk = sentence
-                        current_sentences = [sentence]
+                    # Keep trailing sentences (up to chunk_overlap words) as
+                    # the start of the next chunk
+                    while current_sentences and (
+                        current_word_count > self.chunk_overlap
+                        or current_word_count + sentence_word_count > self.chunk_size
+                    ):
+                        current_word_count -= current_sentences.popleft()[1]
+                
+                current_sentences.append((sentence, sentence_word_count))
+                current_word_count += sentence_word_count
             
             # Don't forget the last chunk
-            if current_chunk:
-                chunks.append(self._create_chunk(
-                    chunk_id, current_chunk, page_num, 
-                    document_data["metadata"], current_sentences
-                ))
+            if current_sentences:
+                yield self._create_chunk(
+                    chunk_id, " ".join(text for text, _ in current_sentences), page_num, 
+                    doc_metadata, len(current_sentences), current_word_count
+                )
                 chunk_id += 1
-        
-        logger.info(f"Split document into {len(chunks)} chunks")
-        return chunks
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """Simple sentence splitting (can be improved with NLTK/spaCy)."""
-        import re
-        
-        # Basic sentence splitting on periods, exclamation marks, question marks
-        sentences = re.split(r'[.!?]+', text)
-        
-        # Clean and filter sentences
-        cleaned_sentences = []
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if sentence and len(sentence) > 10:  # Filter very short fragments
-                cleaned_sentences.append(sentence)
-        
-        return cleaned_sentences
+        # Split on periods, exclamation marks and question marks, collapse
+        # whitespace and drop very short fragments in a single pass
+        return [
+            sentence
+            for sentence in (_WS_RE.sub(' ', part).strip() for part in _SENT_RE.split(text))
+            if len(sentence) > 10
+        ]
     
     def _create_chunk(self, chunk_id: int, text: str, page_num: int, 
-                     doc_metadata: Dict[str, Any], sentences: List[str]) -> Dict[str, Any]:
-        """Create a chunk dictionary with metadata."""
+                     doc_metadata: Dict[str, Any], sentence_count: int,
+                     word_count: int) -> Dict[str, Any]:
+        """Create a chunk dictionary with metadata, given its sentence and word counts."""
         return {
             "chunk_id": chunk_id,
             "text": text.strip(),
@@ -262,8 +321,8 @@ class DocumentProcessor:
                 "source": doc_metadata["source"],
                 "page": page_num,
                 "chunk_index": chunk_id,
-                "word_count": len(text.split()),
-                "sentence_count": len(sentences),
+                "word_count": word_count,
+                "sentence_count": sentence_count,
                 "extraction_method": doc_metadata["extraction_method"]
             }
         }
\ No newline at end of file
@@ -1,23 +1,326 @@
 """Embedding generation service using OpenAI."""
 
 import logging
-from typing import List, Dict, Any
+import hashlib
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Any, AsyncIterator, Iterable, Iterator, Optional, Tuple
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r'\s+')
+
+
+@dataclass
+class ChunkBatch:
+    """
+    A batch of embedded document chunks, stored column-wise.
+    
+    Each field holds one value per chunk, in order; the embeddings are a
+    single (n, dimension) matrix rather than one array per chunk.
+    """
+    
+    chunk_ids: List[int]
+    texts: List[str]
+    metadata: List[Dict[str, Any]]
+    embeddings: np.ndarray
+    scales: Optional[np.ndarray] = None  # per-chunk scales of int8 embeddings
+    model: str = "unknown"
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def to_chunks(self) -> List[Dict[str, Any]]:
+        """Convert to chunk dictionaries with embedding fields added."""
+        dimension = self.embeddings.shape[1]
+        chunks = [
+            {
+                "chunk_id": chunk_id,
+                "text": text,
+                "metadata": metadata,
+                "embedding": embedding,
+                "embedding_model": self.model,
+                "embedding_dimension": dimension
+            }
+            for chunk_id, text, metadata, embedding
+            in zip(self.chunk_ids, self.texts, self.metadata, self.embeddings)
+        ]
+        
+        if self.scales is not None:
+            for chunk, scale in zip(chunks, self.scales.tolist()):
+                chunk["embedding_scale"] = scale
+        
+        return chunks
+
 
 class EmbeddingService:
     """Handles embedding generation using OpenAI's embedding models."""
     
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
-        self.client = OpenAI(api_key=api_key)
+    QUANTIZATION_MODES = ("fp32", "fp16", "int8")
+    
+    # Transient OpenAI errors are retried with exponential backoff and jitter
+    RETRYABLE_ERRORS = (
+        openai.RateLimitError,
+        openai.APIConnectionError,  # includes APITimeoutError
+        openai.InternalServerError
+    )
+    RETRY_ATTEMPTS = 6
+    RETRY_INITIAL_WAIT = 0.5
+    RETRY_MAX_WAIT = 30.0
+    
+    # Errors that smaller batches can't fix, so failed batches aren't split
+    FATAL_ERRORS = (
+        openai.AuthenticationError,
+        openai.PermissionDeniedError,
+        openai.NotFoundError
+    )
+    
+    def __init__(self, api_key: str, model: str = "text-embedding-3-small",
+                 cache_size: int = 4096, redis_url: Optional[str] = None,
+                 cache_ttl: int = 3600, quantization: str = "fp16",
+                 cache_path: Optional[str] = ".embed_cache.sqlite"):
+        if quantization not in self.QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unsupported quantization '{quantization}', "
+                f"expected one of {', '.join(self.QUANTIZATION_MODES)}"
+            )
+        
+        # Retries are handled by _create_embeddings, not by the SDK
+        self.client = OpenAI(api_key=api_key, max_retries=0)
+        self.api_key = api_key
         self.model = model
+        
+        # Async client for concurrent batch requests, created lazily per event loop
+        self._aclient: Optional[AsyncOpenAI] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
         self.embedding_dimension = self._get_embedding_dimension()
         
+        # Shared read-only fallback for empty texts and failed batches
+        self._zero_vector = np.zeros(self.embedding_dimension, dtype=np.float32)
+        self._zero_vector.setflags(write=False)
+        
+        # Storage precision for chunk embeddings: fp32, fp16 or int8
+        self.quantization = quantization
+        
+        # In-process LRU cache of embeddings keyed by cleaned text, shared with
+        # the executor threads behind asearch_documents
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Query embeddings keyed by case- and whitespace-insensitive text;
+        # embed_query_async reaches it from executor threads
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_lock = threading.Lock()
+        self._redis = self._connect_redis(redis_url) if redis_url else None
+        
+        # Persistent content-hash cache, so re-ingested text skips the API
+        self._db_lock = threading.Lock()
+        self._db = self._connect_sqlite(cache_path) if cache_path else None
+        
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get the pooled async OpenAI client for the running event loop."""
+        # Pooled connections are bound to the loop that opened them, so a
+        # new event loop (e.g. a second asyncio.run) needs its own client
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+                )
+            )
+            self._aclient_loop = loop
+        return self._aclient
+    
+    async def aclose(self) -> None:
+        """Close the pooled async OpenAI client."""
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
+            self._aclient_loop = None
+    
+    def _connect_redis(self, redis_url: str):
+        """Connect to the optional Redis embedding cache."""
+        try:
+            import redis
+            
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            logger.info("Using Redis embedding cache")
+            return client
+        except ImportError:
+            logger.warning("redis not installed, using in-process embedding cache only")
+        except Exception as e:
+            logger.warning(f"Redis embedding cache unavailable: {e}")
+        return None
+    
+    def _connect_sqlite(self, cache_path: str) -> Optional[sqlite3.Connection]:
+        """Open (or create) the persistent SQLite embedding cache."""
+        try:
+            db = sqlite3.connect(cache_path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT, sha256 BLOB, dtype TEXT, vec BLOB, "
+                "PRIMARY KEY (model, sha256))"
+            )
+            db.commit()
+            logger.info(f"Using persistent embedding cache at {cache_path}")
+            return db
+        except Exception as e:
+            logger.warning(f"Persistent embedding cache unavailable: {e}")
+        return None
+    
+    def _load_persisted(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Bulk-load embeddings for texts from the SQLite cache."""
+        digests = {hashlib.sha256(text.encode("utf-8")).digest(): text for text in texts}
+        keys = list(digests)
+        found = {}
+        
+        try:
+            with self._db_lock:
+                # Stay well below SQLite's limit on bound parameters
+                for i in range(0, len(keys), 500):
+                    batch = keys[i:i + 500]
+                    rows = self._db.execute(
+                        "SELECT sha256, dtype, vec FROM embeddings "
+                        f"WHERE model = ? AND sha256 IN ({', '.join('?' * len(batch))})",
+                        [self.model, *batch]
+                    ).fetchall()
+                    
+                    for digest, dtype, vec in rows:
+                        found[digests[digest]] = self._freeze(np.frombuffer(vec, dtype=dtype).astype(np.float32))
+        except Exception as e:
+            logger.warning(f"Persistent cache lookup failed: {e}")
+        
+        return found
+    
+    def _persist(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Write embeddings to the SQLite cache in a single transaction."""
+        # Stored as float32 like the memory and Redis layers, so every cache
+        # layer returns the same vector (older float16 rows still load)
+        rows = [
+            (self.model, hashlib.sha256(text.encode("utf-8")).digest(), "float32",
+             np.asarray(embedding, dtype=np.float32).tobytes())
+            for text, embedding in embeddings.items()
+        ]
+        
+        try:
+            with self._db_lock, self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, sha256, dtype, vec) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+        except Exception as e:
+            logger.warning(f"Persistent cache write failed: {e}")
+    
+    def _cache_key(self, text: str) -> str:
+        """Build the shared cache key for a cleaned text."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"emb:{self.model}:{digest}"
+    
+    def _get_cached_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Look up a single embedding in the caches."""
+        return self._get_cached_embeddings([text]).get(text)
+    
+    def _get_cached_embeddings(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up embeddings in the local cache, then in Redis, then in SQLite.
+        
+        Cached embeddings are read-only float32 arrays, returned without copying.
+        """
+        found = {}
+        
+        for text in texts:
+            if text in found:
+                continue
+            
+            with self._cache_lock:
+                embedding = self._cache.get(text)
+                if embedding is not None:
+                    self._cache.move_to_end(text)
+            if embedding is not None:
+                logger.debug("Embedding cache HIT (memory)")
+                found[text] = embedding
+                continue
+            
+            if self._redis is not None:
+                try:
+                    raw = self._redis.get(self._cache_key(text))
+                except Exception as e:
+                    logger.warning(f"Redis cache lookup failed: {e}")
+                    raw = None
+                
+                if raw is not None:
+                    embedding = np.frombuffer(raw, dtype=np.float32)
+                    self._store_local(text, embedding)
+                    logger.debug("Embedding cache HIT (redis)")
+                    found[text] = embedding
+        
+        missing = [text for text in texts if text not in found]
+        if missing and self._db is not None:
+            persisted = self._load_persisted(missing)
+            for text, embedding in persisted.items():
+                self._store_local(text, embedding)
+                found[text] = embedding
+            if persisted:
+                logger.debug(f"Embedding cache HIT (sqlite) for {len(persisted)} texts")
+        
+        return found
+    
+    def _cache_embedding(self, text: str, embedding: np.ndarray) -> None:
+        """Store a single embedding in the caches."""
+        self._cache_embeddings({text: embedding})
+    
+    def _cache_embeddings(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Store read-only float32 embeddings in the local cache, in Redis and in SQLite."""
+        for text, embedding in embeddings.items():
+            self._store_local(text, embedding)
+            
+            if self._redis is not None:
+                try:
+                    self._redis.set(
+                        self._cache_key(text),
+                        embedding.tobytes(),
+                        ex=self.cache_ttl
+                    )
+                except Exception as e:
+                    logger.warning(f"Redis cache write failed: {e}")
+        
+        if self._db is not None:
+            self._persist(embeddings)
+    
+    def _store_local(self, text: str, embedding: np.ndarray) -> None:
+        """Insert into the in-process LRU cache, evicting the oldest entry."""
+        if self.cache_size <= 0:
+            return
+        
+        with self._cache_lock:
+            self._cache[text] = embedding
+            self._cache.move_to_end(text)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+    @staticmethod
+    def _freeze(embedding: np.ndarray) -> np.ndarray:
+        """Mark an array read-only so it can be shared through the caches."""
+        embedding.setflags(write=False)
+        return embedding
+    
     def _get_embedding_dimension(self) -> int:
         """Get the dimension of embeddings for the current model."""
         model_dimensions = {
@@ -27,7 +330,7 @@ class EmbeddingService:
         }
         return model_dimensions.get(self.model, 1536)
     
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -35,7 +338,7 @@ class EmbeddingService:
             text: Input text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            Read-only float32 array holding the embedding vector
         """
         try:
             # Clean and prepare text
@@ -43,115 +346,363 @@ class EmbeddingService:
             
             if not cleaned_text:
                 logger.warning("Empty text provided for embedding")
-                return [0.0] * self.embedding_dimension
+                return self._zero_vector
             
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=cleaned_text
-            )
+            cached = self._get_cached_embedding(cleaned_text)
+            if cached is not None:
+                return cached
             
-            embedding = response.data[0].embedding
+            response = self._create_embeddings(cleaned_text)
+            
+            embedding = self._freeze(np.asarray(response.data[0].embedding, dtype=np.float32))
             logger.debug(f"Generated embedding with dimension: {len(embedding)}")
             
+            self._cache_embedding(cleaned_text, embedding)
             return embedding
             
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}")
             raise
     
-    def generate_embeddings_batch(self, texts: List[str], batch_size: int = 100) -> List[List[float]]:
+    def generate_embeddings_batch(self, texts: List[str], batch_size: int = 100,
+                                  concurrency: int = 8) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batches.
         
+        Synchronous wrapper around generate_embeddings_batch_async.
+        
         Args:
             texts: List of texts to embed
             batch_size: Number of texts to process in each batch
+            concurrency: Maximum number of batches in flight at once
             
         Returns:
-            List of embedding vectors
+            (len(texts), dimension) float32 array of embedding vectors
         """
-        embeddings = []
+        async def run() -> np.ndarray:
+            try:
+                return await self.generate_embeddings_batch_async(texts, batch_size, concurrency)
+            finally:
+                # The event loop ends with this call, so its client can't be reused
+                await self.aclose()
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = self._process_batch(batch)
-            embeddings.extend(batch_embeddings)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        
+        # Called from inside an event loop: run on a separate thread's loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
+    
+    async def generate_embeddings_batch_async(self, texts: List[str], batch_size: int = 100,
+                                              concurrency: int = 8) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts with concurrent batch requests.
+        
+        Args:
+            texts: List of texts to embed
+            batch_size: Number of texts to process in each batch
+            concurrency: Maximum number of batches in flight at once
             
-            logger.info(f"Processed batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1}")
+        Returns:
+            (len(texts), dimension) float32 array of embedding vectors, in
+            the same order as texts
+        """
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def bounded(batch_num: int, batch: List[str]) -> np.ndarray:
+            async with semaphore:
+                batch_embeddings = await self._process_batch_async(batch)
+            logger.info(f"Processed batch {batch_num}/{len(batches)}")
+            return batch_embeddings
         
-        return embeddings
+        results = await asyncio.gather(
+            *(bounded(num, batch) for num, batch in enumerate(batches, 1))
+        )
+        
+        if not results:
+            return np.empty((0, self.embedding_dimension), dtype=np.float32)
+        return np.vstack(results)
     
-    def _process_batch(self, texts: List[str]) -> List[List[float]]:
+    def _process_batch(self, texts: List[str]) -> np.ndarray:
         """Process a batch of texts for embedding generation."""
         try:
-            # Clean all texts in the batch
-            cleaned_texts = [self._clean_text(text) for text in texts]
-            
-            # Filter out empty texts but keep track of indices
-            valid_texts = []
-            valid_indices = []
-            
-            for idx, text in enumerate(cleaned_texts):
-                if text:
-                    valid_texts.append(text)
-                    valid_indices.append(idx)
-            
-            if not valid_texts:
-                logger.warning("No valid texts in batch")
-                return [[0.0] * self.embedding_dimension] * len(texts)
-            
-            # Generate embeddings for valid texts
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=valid_texts
-            )
+            pairs, embeddings, missing = self._prepare_batch(texts)
             
-            # Reconstruct full results with empty embeddings for invalid texts
-            embeddings = []
-            valid_iter = iter(response.data)
+            if missing:
+                embeddings.update(self._embed_missing(missing))
             
-            for idx in range(len(texts)):
-                if idx in valid_indices:
-                    embeddings.append(next(valid_iter).embedding)
-                else:
-                    embeddings.append([0.0] * self.embedding_dimension)
+            return self._assemble_batch(texts, pairs, embeddings)
             
-            return embeddings
+        except self.FATAL_ERRORS:
+            # A bad key or request fails every batch; don't index zero vectors
+            raise
+        except Exception as e:
+            logger.error(f"Failed to process batch: {e}")
+            # Return zero embeddings for the entire batch
+            return self._zero_batch(len(texts))
+    
+    async def _process_batch_async(self, texts: List[str]) -> np.ndarray:
+        """Process a batch of texts for embedding generation with the async client."""
+        try:
+            pairs, embeddings, missing = self._prepare_batch(texts)
+            
+            if missing:
+                embeddings.update(await self._embed_missing_async(missing))
+            
+            return self._assemble_batch(texts, pairs, embeddings)
             
+        except self.FATAL_ERRORS:
+            # A bad key or request fails every batch; don't index zero vectors
+            raise
         except Exception as e:
             logger.error(f"Failed to process batch: {e}")
             # Return zero embeddings for the entire batch
-            return [[0.0] * self.embedding_dimension] * len(texts)
+            return self._zero_batch(len(texts))
     
-    def generate_embeddings_for_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _embed_missing(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Embed texts, splitting the batch in half whenever a request fails.
+        
+        Texts that still fail on their own are left out of the result (and
+        out of the caches, so a later run embeds them again).
+        """
+        try:
+            return self._cache_response(texts, self._create_embeddings(texts))
+        except self.FATAL_ERRORS:
+            raise
+        except Exception as e:
+            if len(texts) == 1:
+                logger.error(f"Failed to embed text {self._cache_key(texts[0])}: {e}")
+                return {}
+            
+            logger.warning(f"Embedding request for {len(texts)} texts failed, splitting batch: {e}")
+            mid = len(texts) // 2
+            return {**self._embed_missing(texts[:mid]), **self._embed_missing(texts[mid:])}
+    
+    async def _embed_missing_async(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Async version of _embed_missing."""
+        try:
+            return self._cache_response(texts, await self._acreate_embeddings(texts))
+        except self.FATAL_ERRORS:
+            raise
+        except Exception as e:
+            if len(texts) == 1:
+                logger.error(f"Failed to embed text {self._cache_key(texts[0])}: {e}")
+                return {}
+            
+            logger.warning(f"Embedding request for {len(texts)} texts failed, splitting batch: {e}")
+            mid = len(texts) // 2
+            first, second = await asyncio.gather(
+                self._embed_missing_async(texts[:mid]),
+                self._embed_missing_async(texts[mid:])
+            )
+            return {**first, **second}
+    
+    def _create_embeddings(self, texts):
+        """Call the embeddings API, retrying transient errors with backoff."""
+        for attempt in range(self.RETRY_ATTEMPTS):
+            try:
+                return self.client.embeddings.create(model=self.model, input=texts)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.RETRY_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"Embedding request failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    async def _acreate_embeddings(self, texts):
+        """Async version of _create_embeddings."""
+        for attempt in range(self.RETRY_ATTEMPTS):
+            try:
+                return await self._get_async_client().embeddings.create(model=self.model, input=texts)
+            except self.RETRYABLE_ERRORS as e:
+                if attempt == self.RETRY_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"Embedding request failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with up to a second of random jitter."""
+        return min(self.RETRY_MAX_WAIT, self.RETRY_INITIAL_WAIT * 2 ** attempt) + random.random()
+    
+    def _prepare_batch(self, texts: List[str]) -> Tuple[List[Tuple[int, str]], Dict[str, np.ndarray], List[str]]:
+        """
+        Clean a batch and split it into cached embeddings and texts to embed.
+        
+        Returns:
+            Tuple of ((index, cleaned text) pairs for non-empty texts,
+            cached embeddings by text, unique texts still to be embedded)
+        """
+        # Clean texts and drop empty ones in a single pass, keeping positions
+        pairs = [(idx, cleaned) for idx, text in enumerate(texts) if (cleaned := self._clean_text(text))]
+        if not pairs:
+            logger.warning("No valid texts in batch")
+            return pairs, {}, []
+        
+        valid_texts = [text for _, text in pairs]
+        embeddings = self._get_cached_embeddings(valid_texts)
+        
+        # Only send texts that aren't cached, each one once
+        missing = list(dict.fromkeys(text for text in valid_texts if text not in embeddings))
+        logger.debug(f"Batch embedding cache hits: {len(valid_texts) - len(missing)}/{len(valid_texts)}")
+        
+        return pairs, embeddings, missing
+    
+    def _cache_response(self, texts: List[str], response) -> Dict[str, np.ndarray]:
+        """Map texts to the embeddings in an API response and cache them."""
+        if len(response.data) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(response.data)}")
+        
+        # Every row must be written exactly once, or np.empty garbage would be cached
+        if sorted(data.index for data in response.data) != list(range(len(texts))):
+            raise ValueError("Embedding response indices don't cover the batch exactly once")
+        
+        # Copy the response straight into one float32 matrix; each text maps
+        # to a read-only row view of it. Rows are placed by each item's
+        # index, so the result doesn't depend on the order of response.data
+        matrix = np.empty((len(texts), len(response.data[0].embedding)), dtype=np.float32)
+        for data in response.data:
+            matrix[data.index] = data.embedding
+        self._freeze(matrix)
+        
+        fresh = dict(zip(texts, matrix))
+        self._cache_embeddings(fresh)
+        return fresh
+    
+    def _assemble_batch(self, texts: List[str], pairs: List[Tuple[int, str]],
+                        embeddings: Dict[str, np.ndarray]) -> np.ndarray:
+        """Place embeddings at their batch positions, with zero vectors for empty texts."""
+        if not embeddings:
+            return self._zero_batch(len(texts))
+        
+        dimension = len(next(iter(embeddings.values())))
+        results = np.zeros((len(texts), dimension), dtype=np.float32)
+        for idx, text in pairs:
+            # Texts that failed to embed keep their zero vector
+            embedding = embeddings.get(text)
+            if embedding is not None:
+                results[idx] = embedding
+        return results
+    
+    def _zero_batch(self, count: int) -> np.ndarray:
+        """A read-only (count, dimension) batch of zero vectors that allocates no rows."""
+        return np.broadcast_to(self._zero_vector, (count, self.embedding_dimension))
+    
+    def generate_embeddings_for_chunks(self, chunks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Generate embeddings for document chunks.
         
         Args:
-            chunks: List of chunk dictionaries from document processor
+            chunks: Chunk dictionaries from document processor (any iterable)
             
         Returns:
             List of chunks with embeddings added
         """
-        logger.info(f"Generating embeddings for {len(chunks)} chunks")
+        enriched_chunks = [
+            chunk
+            for batch in self.iter_embeddings_for_chunks(chunks)
+            for chunk in batch
+        ]
         
-        # Extract texts from chunks
-        texts = [chunk["text"] for chunk in chunks]
+        logger.info(f"Successfully generated embeddings for {len(enriched_chunks)} chunks")
+        return enriched_chunks
+    
+    def iter_embeddings_for_chunks(self, chunks: Iterable[Dict[str, Any]], batch_size: int = 100,
+                                   concurrency: int = 8) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lazily generate embeddings for a stream of document chunks.
         
-        # Generate embeddings in batches
-        embeddings = self.generate_embeddings_batch(texts)
+        Like iter_chunk_batches, but yields chunk dictionaries.
         
-        # Add embeddings to chunks
-        enriched_chunks = []
-        for chunk, embedding in zip(chunks, embeddings):
-            enriched_chunk = chunk.copy()
-            enriched_chunk["embedding"] = embedding
-            enriched_chunk["embedding_model"] = self.model
-            enriched_chunk["embedding_dimension"] = len(embedding)
-            enriched_chunks.append(enriched_chunk)
+        Args:
+            chunks: Iterable of chunk dictionaries, e.g. from iter_chunks
+            batch_size: Number of texts per embedding request
+            concurrency: Maximum number of requests in flight at once
+            
+        Yields:
+            Lists of chunks with embeddings added, in input order
+        """
+        for batch in self.iter_chunk_batches(chunks, batch_size, concurrency):
+            yield batch.to_chunks()
+    
+    def iter_chunk_batches(self, chunks: Iterable[Dict[str, Any]], batch_size: int = 100,
+                           concurrency: int = 8) -> Iterator[ChunkBatch]:
+        """
+        Lazily generate embeddings for a stream of document chunks.
         
-        logger.info(f"Successfully generated embeddings for {len(enriched_chunks)} chunks")
-        return enriched_chunks
+        Chunks are read batch_size * concurrency at a time, so each window
+        still fills every concurrent request while the rest of the stream
+        (e.g. PDF extraction) hasn't been produced yet.
+        
+        Args:
+            chunks: Iterable of chunk dictionaries, e.g. from iter_chunks
+            batch_size: Number of texts per embedding request
+            concurrency: Maximum number of requests in flight at once
+            
+        Yields:
+            ChunkBatch for each window of chunks, in input order
+        """
+        chunks = iter(chunks)
+        window = batch_size * concurrency
+        
+        while True:
+            batch = list(islice(chunks, window))
+            if not batch:
+                break
+            
+            logger.info(f"Generating embeddings for {len(batch)} chunks")
+            texts = [chunk["text"] for chunk in batch]
+            embeddings = self.generate_embeddings_batch(texts, batch_size, concurrency)
+            yield self._chunk_batch(batch, texts, embeddings)
+    
+    async def aiter_chunk_batches(self, chunks: Iterable[Dict[str, Any]], batch_size: int = 100,
+                                  concurrency: int = 8) -> AsyncIterator[ChunkBatch]:
+        """
+        Async version of iter_chunk_batches.
+        
+        The chunk stream is read on a worker thread, so producing chunks
+        (e.g. PDF extraction) doesn't block the event loop.
+        
+        Args:
+            chunks: Iterable of chunk dictionaries, e.g. from iter_chunks
+            batch_size: Number of texts per embedding request
+            concurrency: Maximum number of requests in flight at once
+            
+        Yields:
+            ChunkBatch for each window of chunks, in input order
+        """
+        chunks = iter(chunks)
+        window = batch_size * concurrency
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = await loop.run_in_executor(None, lambda: list(islice(chunks, window)))
+            if not batch:
+                break
+            
+            logger.info(f"Generating embeddings for {len(batch)} chunks")
+            texts = [chunk["text"] for chunk in batch]
+            embeddings = await self.generate_embeddings_batch_async(texts, batch_size, concurrency)
+            yield self._chunk_batch(batch, texts, embeddings)
+    
+    def _chunk_batch(self, chunks: List[Dict[str, Any]], texts: List[str],
+                     embeddings: np.ndarray) -> ChunkBatch:
+        """Build a ChunkBatch from chunks and their raw embedding matrix."""
+        # Store unit-length vectors so similarity is a single dot product,
+        # quantized to cut memory and payload size
+        vectors, scales = self.quantize_batch(self.normalize_batch(embeddings))
+        return ChunkBatch(
+            chunk_ids=[chunk["chunk_id"] for chunk in chunks],
+            texts=texts,
+            metadata=[chunk["metadata"] for chunk in chunks],
+            embeddings=vectors,
+            scales=scales,
+            model=self.model
+        )
     
     def _clean_text(self, text: str) -> str:
         """Clean and prepare text for embedding generation."""
@@ -159,19 +710,148 @@ class EmbeddingService:
             return ""
         
         # Remove excessive whitespace
-        cleaned = " ".join(text.split())
+        cleaned = _WS_RE.sub(" ", text).strip()
         
-        # Truncate if too long (OpenAI has token limits)
+        # Truncate if too long (OpenAI has token limits). Budget by characters
+        # (~4 per token) so the text doesn't have to be split just to measure it
         max_tokens = 8000  # Conservative limit for text-embedding models
-        words = cleaned.split()
+        max_chars = max_tokens * 4
         
-        if len(words) > max_tokens:
-            cleaned = " ".join(words[:max_tokens])
-            logger.warning(f"Text truncated to {max_tokens} words")
+        if len(cleaned) > max_chars:
+            cleaned = cleaned[:max_chars].rsplit(" ", 1)[0]
+            logger.warning(f"Text truncated to {max_chars} characters")
         
         return cleaned
     
-    async def generate_embedding_async(self, text: str) -> List[float]:
+    def embed_query(self, text: str) -> np.ndarray:
+        """
+        Generate the embedding for a search query.
+        
+        Queries that differ only in case or whitespace share one
+        embedding, on top of the exact-text caches used by
+        generate_embedding.
+        
+        Args:
+            text: Query text to embed
+            
+        Returns:
+            Read-only float32 array holding the embedding vector
+        """
+        key = self._query_key(text)
+        
+        embedding = self._get_query_embedding(key)
+        if embedding is not None:
+            return embedding
+        
+        embedding = self.generate_embedding(text)
+        self._cache_query_embedding(key, embedding)
+        
+        return embedding
+    
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for many search queries at once.
+        
+        Queries missing from the query cache are embedded together with
+        generate_embeddings_batch rather than one request per query.
+        
+        Args:
+            texts: Query texts to embed
+            
+        Returns:
+            (len(texts), dimension) float32 array of embedding vectors
+        """
+        keys = [self._query_key(text) for text in texts]
+        cached = {key: embedding for key in keys
+                  if (embedding := self._get_query_embedding(key)) is not None}
+        
+        # Embed each distinct missing query once
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        if missing:
+            embeddings = self.generate_embeddings_batch(list(missing.values()))
+            for key, embedding in zip(missing, embeddings):
+                embedding = self._freeze(embedding)
+                self._cache_query_embedding(key, embedding)
+                cached[key] = embedding
+        
+        if not keys:
+            return self._zero_batch(0)
+        return np.vstack([cached[key] for key in keys])
+    
+    @staticmethod
+    def _query_key(text: str) -> str:
+        """
+        Normalize a query so differences in case and spacing share a cache entry.
+        
+        Punctuation is kept, since it can change the meaning ("C++" and "C").
+        """
+        return _WS_RE.sub(" ", text.lower()).strip()
+    
+    def _get_query_embedding(self, key: str) -> Optional[np.ndarray]:
+        """
+        Look up a normalized query in the query embedding cache, then in Redis.
+        
+        Redis lets processes serving the same queries share their hits.
+        """
+        with self._query_lock:
+            embedding = self._query_cache.get(key)
+            if embedding is not None:
+                self._query_cache.move_to_end(key)
+        if embedding is not None:
+            logger.debug("Query embedding cache HIT")
+            return embedding
+        
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._query_cache_key(key))
+            except Exception as e:
+                logger.warning(f"Redis cache lookup failed: {e}")
+                raw = None
+            
+            if raw is not None:
+                embedding = np.frombuffer(raw, dtype=np.float32)
+                self._store_query_local(key, embedding)
+                logger.debug("Query embedding cache HIT (redis)")
+                return embedding
+        
+        return None
+    
+    def _cache_query_embedding(self, key: str, embedding: np.ndarray) -> None:
+        """Add a query embedding to the LRU query cache and to Redis."""
+        self._store_query_local(key, embedding)
+        
+        if self._redis is not None:
+            try:
+                self._redis.set(
+                    self._query_cache_key(key),
+                    np.asarray(embedding, dtype=np.float32).tobytes(),
+                    ex=self.cache_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+    
+    def _store_query_local(self, key: str, embedding: np.ndarray) -> None:
+        """Insert into the in-process query LRU cache, evicting the oldest entry."""
+        if self.cache_size <= 0:
+            return
+        
+        with self._query_lock:
+            self._query_cache[key] = embedding
+            self._query_cache.move_to_end(key)
+            if len(self._query_cache) > self.cache_size:
+                self._query_cache.popitem(last=False)
+    
+    def _query_cache_key(self, key: str) -> str:
+        """Build the shared cache key for a normalized query."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return f"qemb:{self.model}:{digest}"
+    
+    async def embed_query_async(self, text: str) -> np.ndarray:
+        """Async version of embed_query."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.embed_query, text)
+    
+    async def generate_embedding_async(self, text: str) -> np.ndarray:
         """
         Async version of embedding generation.
         
@@ -179,7 +859,7 @@ class EmbeddingService:
             text: Input text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            Read-only float32 array holding the embedding vector
         """
         # Run the synchronous method in a thread pool
         loop = asyncio.get_event_loop()
@@ -207,4 +887,205 @@ class EmbeddingService:
         if norm1 == 0 or norm2 == 0:
             return 0.0
         
-        return dot_product / (norm1 * norm2)
\ No newline at end of file
+        return dot_product / (norm1 * norm2)
+    
+    @staticmethod
+    def normalize(embedding: List[float]) -> np.ndarray:
+        """
+        Convert an embedding to a contiguous, L2-normalized float32 array.
+        
+        Zero vectors are returned unchanged.
+        """
+        vec = np.array(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec /= norm
+        return vec
+    
+    @staticmethod
+    def normalize_batch(embeddings: np.ndarray) -> np.ndarray:
+        """
+        L2-normalize each row of an embedding matrix into a new float32 array.
+        
+        Zero rows are returned unchanged.
+        """
+        matrix = np.array(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+    
+    def quantize(self, embedding: np.ndarray) -> Tuple[np.ndarray, Optional[float]]:
+        """
+        Quantize a normalized float32 embedding to the configured precision.
+        
+        Returns:
+            Tuple of (quantized vector, scale); scale is only set for int8,
+            where the original vector is approximately vector * scale
+        """
+        if self.quantization == "fp16":
+            return embedding.astype(np.float16), None
+        
+        if self.quantization == "int8":
+            # Symmetric quantization around zero
+            max_abs = float(np.abs(embedding).max()) if embedding.size else 0.0
+            if max_abs == 0:
+                return np.zeros(embedding.shape, dtype=np.int8), 1.0
+            scale = max_abs / 127
+            quantized = np.clip(np.round(embedding / scale), -127, 127).astype(np.int8)
+            return quantized, scale
+        
+        return embedding, None
+    
+    def quantize_batch(self, embeddings: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Quantize each row of a normalized embedding matrix, as quantize does.
+        
+        Returns:
+            Tuple of (quantized matrix, scales); scales is a float32 array
+            with one entry per row, only set for int8
+        """
+        if self.quantization == "fp16":
+            return embeddings.astype(np.float16), None
+        
+        if self.quantization == "int8":
+            max_abs = np.abs(embeddings).max(axis=1) if embeddings.size else np.zeros(len(embeddings))
+            scales = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+            quantized = np.clip(np.round(embeddings / scales[:, None]), -127, 127).astype(np.int8)
+            return quantized, scales
+        
+        return embeddings, None
+    
+    @staticmethod
+    def dequantize(embedding: np.ndarray, scale: Optional[float] = None) -> np.ndarray:
+        """Convert a (possibly quantized) embedding back to float32."""
+        vec = embedding.astype(np.float32)
+        if scale is not None:
+            vec *= scale
+        return vec
+    
+    @staticmethod
+    def cosine_similarity_normalized(embedding1: np.ndarray, embedding2: np.ndarray,
+                                     scale1: Optional[float] = None,
+                                     scale2: Optional[float] = None) -> float:
+        """
+        Cosine similarity between two embeddings already passed through normalize().
+        
+        Quantized embeddings are supported: int8 vectors are multiplied with
+        int32 accumulation and then rescaled by their quantization scales.
+        
+        Returns:
+            Cosine similarity score between -1 and 1
+        """
+        if embedding1.dtype == np.int8 and embedding2.dtype == np.int8:
+            dot = int(np.dot(embedding1.astype(np.int32), embedding2.astype(np.int32)))
+            return dot * (scale1 or 1.0) * (scale2 or 1.0)
+        
+        vec1 = EmbeddingService.dequantize(embedding1, scale1)
+        vec2 = EmbeddingService.dequantize(embedding2, scale2)
+        return float(vec1 @ vec2)
+    
+    def cosine_similarity_batch(self, query_embedding: List[float], matrix: np.ndarray) -> np.ndarray:
+        """
+        Score a query against many normalized embeddings at once.
+        
+        Args:
+            query_embedding: Query vector (normalized here)
+            matrix: (N, d) float array of normalized embeddings, one per row
+                (dequantize int8 rows first)
+            
+        Returns:
+            Array of N cosine similarity scores
+        """
+        return matrix @ self.normalize(query_embedding)
+
+
+class SemanticCache:
+    """
+    LRU cache keyed by embedding, matched by cosine similarity.
+    
+    A lookup returns the value stored under the most similar key if its
+    cosine similarity is at least `threshold`, so near-duplicate queries
+    share results. Keys live in one normalized float32 matrix and are
+    searched with a single matrix-vector product (an exact flat
+    inner-product index).
+    
+    Values are lists of result dictionaries. They are copied on the way in
+    and out, so callers can modify the results they get.
+    """
+    
+    def __init__(self, threshold: float = 0.95, capacity: int = 1024):
+        self.threshold = threshold
+        self.capacity = capacity
+        self._keys: Optional[np.ndarray] = None
+        self._values: List[Any] = []
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._clock = 0
+    
+    def get(self, embedding: np.ndarray, params: Any = None) -> Optional[Any]:
+        """
+        Look up the value cached for the most similar embedding.
+        
+        Args:
+            embedding: Query embedding
+            params: Extra lookup parameters that must match exactly
+                (e.g. top_k and threshold of a search)
+            
+        Returns:
+            The cached value, or None on a miss
+        """
+        if not self._values:
+            return None
+        
+        query = EmbeddingService.normalize(embedding)
+        if query.shape[0] != self._keys.shape[1]:
+            return None
+        
+        scores = self._keys[:len(self._values)] @ query
+        candidates = np.flatnonzero(scores >= self.threshold)
+        
+        # Most similar first, skipping entries cached with other parameters
+        for slot in candidates[np.argsort(-scores[candidates])]:
+            cached_params, value = self._values[slot]
+            if cached_params == params:
+                self._touch(slot)
+                logger.debug(f"Semantic cache HIT (similarity {scores[slot]:.3f})")
+                return self._copy(value)
+        
+        return None
+    
+    def put(self, embedding: np.ndarray, value: Any, params: Any = None) -> None:
+        """Cache a value under an embedding, evicting the least recently used entry."""
+        if self.capacity <= 0:
+            return
+        
+        value = self._copy(value)
+        
+        key = EmbeddingService.normalize(embedding)
+        if self._keys is None or self._keys.shape[1] != key.shape[0]:
+            self.clear()
+            self._keys = np.zeros((self.capacity, key.shape[0]), dtype=np.float32)
+        
+        if len(self._values) < self.capacity:
+            slot = len(self._values)
+            self._values.append((params, value))
+        else:
+            slot = int(np.argmin(self._last_used))
+            self._values[slot] = (params, value)
+        
+        self._keys[slot] = key
+        self._touch(slot)
+    
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._values = []
+        self._last_used[:] = 0
+    
+    @staticmethod
+    def _copy(value: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copy a list of results, so the cached one is never shared."""
+        return [dict(result) for result in value]
+    
+    def _touch(self, slot: int) -> None:
+        """Mark a slot as most recently used."""
+        self._clock += 1
+        self._last_used[slot] = self._clock
@@ -1,68 +1,555 @@
 """Endee vector database client for storing and retrieving embeddings."""
 
+import base64
+import gzip
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+import time
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Awaitable, Optional, Tuple
 import httpx
 import asyncio
+from itertools import islice
+from urllib.parse import quote
+import numpy as np
 import json
 import uuid
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from .embedding_service import ChunkBatch
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+if orjson is not None:
+    # Request bodies mix NumPy arrays with metadata whose keys may not be
+    # strings (stdlib json would coerce them, so orjson does too)
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback serializer so JSON encoders can handle NumPy values and bytes."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    if isinstance(obj, bytes):
+        # JSON has no binary type, so raw buffers are sent base64-encoded
+        return base64.b64encode(obj).decode("ascii")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+if msgspec is not None:
+    _json_encoder = msgspec.json.Encoder(enc_hook=_json_default)
+    _json_decoder = msgspec.json.Decoder()
+    _msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=_json_default)
+    _msgpack_decoder = msgspec.msgpack.Decoder()
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize to compact JSON bytes.
+    
+    Uses orjson (a requirement, which writes NumPy arrays and strings in
+    C), then msgspec if installed, and stdlib json as a last resort.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS)
+    if msgspec is not None:
+        return _json_encoder.encode(obj)
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON response body, using orjson or msgspec when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return _json_decoder.decode(data)
+    return json.loads(data)
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantize each row of a float matrix to int8 with its own scale and zero point.
+    
+    Each row's value range is mapped onto [-128, 127], so a row is
+    approximately (quantized - zero_point) * scale.
+    
+    Returns:
+        Tuple of (int8 matrix, float32 scales, int32 zero points)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.size == 0:
+        return (np.zeros(vectors.shape, dtype=np.int8),
+                np.ones(len(vectors), dtype=np.float32),
+                np.zeros(len(vectors), dtype=np.int32))
+    
+    # The range always includes 0, which keeps zero points within int8
+    # and lets zero rows round-trip exactly
+    low = np.minimum(vectors.min(axis=1), 0)
+    high = np.maximum(vectors.max(axis=1), 0)
+    scales = np.where(high > low, (high - low) / 255, 1.0).astype(np.float32)
+    zero_points = (-128 - np.round(low / scales)).astype(np.int32)
+    
+    quantized = np.round(vectors / scales[:, None]) + zero_points[:, None]
+    return np.clip(quantized, -128, 127).astype(np.int8), scales, zero_points
+
+
+class _LoopRunner:
+    """
+    Runs coroutines on a private event loop in a daemon thread.
+    
+    Lets synchronous callers use async code without starting a new event
+    loop (and connection pool) for every call.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+    
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the loop and wait for its result."""
+        loop = self._get_loop()
+        
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            coro.close()
+            raise RuntimeError(f"Can't wait for {self.name} from its own event loop")
+        
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    async def run_async(self, coro: Awaitable[Any]) -> Any:
+        """Await a coroutine on the loop from any event loop, including this one."""
+        loop = self._get_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    def stop(self) -> None:
+        """Stop the loop and its thread; a later run() starts new ones."""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the loop, starting it and its thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name=self.name, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
 
 class EndeeClient:
     """Client for interacting with Endee vector database."""
     
-    def __init__(self, base_url: str = "http://localhost:8080", auth_token: Optional[str] = None):
+    # Request bodies at least this large are compressed; smaller ones
+    # aren't worth the CPU time
+    COMPRESS_MIN_BYTES = 16 * 1024
+    COMPRESSION_MODES = ("gzip", "zstd")
+    WIRE_QUANTIZATION_MODES = ("fp32", "int8")
+    
+    # Health check results are reused for this many seconds, so frequent
+    # status polls don't each cost a request
+    HEALTH_CHECK_TTL = 5.0
+    
+    def __init__(self, base_url: str = "http://localhost:8080", auth_token: Optional[str] = None,
+                 compress_requests: bool = False, use_msgpack: bool = False,
+                 binary_vectors: bool = False, compression: str = "gzip", http2: bool = True,
+                 wire_quantization: str = "fp32"):
         self.base_url = base_url.rstrip('/') + "/api/v1"
         self.auth_token = auth_token
+        
+        # Compress request bodies of COMPRESS_MIN_BYTES or more (requires
+        # server support for Content-Encoding; falls back to uncompressed
+        # bodies if the server rejects them)
+        self.compress_requests = compress_requests
+        
+        if compression not in self.COMPRESSION_MODES:
+            raise ValueError(f"compression must be one of {self.COMPRESSION_MODES}, got {compression!r}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, compressing requests with gzip")
+            compression = "gzip"
+        self.compression = compression
+        
+        # HTTP/2 multiplexes concurrent requests over one connection; it
+        # needs the h2 package and is only negotiated for https URLs
+        self.http2 = http2 and h2 is not None
+        
+        # MessagePack bodies are several times smaller than JSON for float
+        # arrays; it needs msgspec and falls back to JSON if the server
+        # rejects it
+        if use_msgpack and msgspec is None:
+            logger.warning("msgspec is not installed, sending JSON instead of MessagePack")
+        self.use_msgpack = use_msgpack and msgspec is not None
+        
+        # Send inserted vectors as little-endian float32 buffers instead of
+        # number arrays (requires server support for "vector_f32")
+        self.binary_vectors = binary_vectors
+        
+        # With "int8", inserted vectors are sent as int8 bytes plus a scale
+        # and zero point ("vector_q8", "scale", "zp"), a quarter of the
+        # float32 size; collections are created with an int8 index
+        if wire_quantization not in self.WIRE_QUANTIZATION_MODES:
+            raise ValueError(
+                f"wire_quantization must be one of {self.WIRE_QUANTIZATION_MODES}, got {wire_quantization!r}"
+            )
+        self.wire_quantization = wire_quantization
         self.headers = self._build_headers()
         
+        # All requests, from the *_sync methods or from any other event
+        # loop, are sent on this background loop, so every caller shares one
+        # long-lived HTTP client and its pooled keep-alive connections
+        self._runner = _LoopRunner("endee-client")
+        self._aclient: Optional[httpx.AsyncClient] = None
+        
+        # Request paths per (collection, endpoint), built once
+        self._paths: Dict[Tuple[str, str], str] = {}
+        
+        # Last health check result and when it was made (time.monotonic)
+        self._health: Optional[bool] = None
+        self._health_checked_at = 0.0
+        
     def _build_headers(self) -> Dict[str, str]:
         """Build HTTP headers for requests."""
         headers = {
             "Content-Type": "application/json",
-            "Accept": "application/json"
+            "Accept": "application/json",
+            "Connection": "keep-alive"
         }
         
+        if self.use_msgpack:
+            headers["Accept"] = f"{MSGPACK_CONTENT_TYPE}, application/json"
+        
         if self.auth_token:
             headers["Authorization"] = f"Bearer {self.auth_token}"
             
         return headers
     
+    def _client_options(self) -> Dict[str, Any]:
+        """
+        Options for the pooled HTTP clients.
+        
+        Requests use paths relative to base_url and inherit the default
+        headers; individual calls only override the timeout when needed.
+        """
+        return {
+            "base_url": self.base_url,
+            "headers": self.headers,
+            "timeout": httpx.Timeout(60.0),
+            "limits": self._build_limits(),
+            "http2": self.http2
+        }
+    
+    def _build_limits(self) -> httpx.Limits:
+        """Connection pool limits of the pooled HTTP clients."""
+        return httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=100,
+            keepalive_expiry=30.0
+        )
+    
+    def _encode_body(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Serialize a request body, compressing large payloads.
+        
+        The body is MessagePack when use_msgpack is enabled, JSON otherwise.
+        
+        Returns:
+            Tuple of (body bytes, headers to add to the client defaults)
+        """
+        if self.use_msgpack:
+            body = _msgpack_encoder.encode(payload)
+            headers = {"Content-Type": MSGPACK_CONTENT_TYPE}
+        else:
+            body = _dumps(payload)
+            headers = {}
+        
+        if not self.compress_requests or len(body) < self.COMPRESS_MIN_BYTES:
+            return body, headers
+        
+        headers["Content-Encoding"] = self.compression
+        if self.compression == "zstd":
+            return zstandard.compress(body, 3), headers
+        
+        # Level 1 is much faster than the default and still shrinks float
+        # arrays several times over
+        return gzip.compress(body, compresslevel=1), headers
+    
+    @staticmethod
+    def _decode_body(response: httpx.Response) -> Any:
+        """Parse a response body as MessagePack or JSON, by its Content-Type."""
+        content_type = response.headers.get("Content-Type", "")
+        if content_type.startswith(MSGPACK_CONTENT_TYPE) and msgspec is not None:
+            return _msgpack_decoder.decode(response.content)
+        return _loads(response.content)
+    
+    async def _apost(self, path: str, payload: Dict[str, Any], timeout: float) -> httpx.Response:
+        """
+        POST an encoded body.
+        
+        A compressed body the server rejects as such (415, or a 400 that
+        mentions the encoding) is retried once uncompressed, and a rejected MessagePack body once as JSON; either
+        setting then stays off for later requests.
+        """
+        body, headers = self._encode_body(payload)
+        response = await self._arequest("POST", path, headers=headers, content=body, timeout=timeout)
+        
+        if "Content-Encoding" in headers and self._rejects_encoding(response):
+            self._disable_compression(response.status_code)
+            body, headers = self._encode_body(payload)
+            response = await self._arequest("POST", path, headers=headers, content=body, timeout=timeout)
+        
+        if response.status_code == 415 and self.use_msgpack:
+            self._disable_msgpack()
+            body, headers = self._encode_body(payload)
+            response = await self._arequest("POST", path, headers=headers, content=body, timeout=timeout)
+        
+        return response
+    
+    @staticmethod
+    def _rejects_encoding(response: httpx.Response) -> bool:
+        """Whether a response rejects the body's Content-Encoding, not its contents."""
+        if response.status_code == 415:
+            return True
+        # Other 400s (bad dimension, missing field) would fail uncompressed too
+        return response.status_code == 400 and "encoding" in response.text.lower()
+    
+    def _disable_compression(self, status_code: int) -> None:
+        """Send uncompressed bodies after the server rejects a compressed one."""
+        logger.warning(
+            f"Endee rejected a {self.compression}-compressed body ({status_code}), "
+            "sending uncompressed bodies"
+        )
+        self.compress_requests = False
+    
+    def _disable_msgpack(self) -> None:
+        """Switch to JSON bodies after the server rejects MessagePack."""
+        logger.warning("Endee rejected a MessagePack body, falling back to JSON")
+        self.use_msgpack = False
+    
+    @staticmethod
+    def _vector_payload(vector: List[float], scale: Optional[float] = None) -> List[float]:
+        """
+        Prepare a vector (list or NumPy array) for a JSON request body.
+        
+        Quantized arrays are converted back to float32, applying `scale`
+        for int8 vectors. Arrays are kept as float32 arrays, which _dumps
+        writes directly without building a Python list.
+        """
+        if isinstance(vector, np.ndarray):
+            if vector.dtype != np.float32:
+                vector = vector.astype(np.float32)
+            if scale is not None:
+                vector = vector * np.float32(scale)
+        return vector
+    
+    def _vector_field(self, vector: List[float], scale: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Build the vector field of an insert entry.
+        
+        With binary_vectors enabled the vector is sent as its raw float32
+        bytes under "vector_f32": a bin value in MessagePack, and a base64
+        string in JSON. Otherwise it is a "vector" number array.
+        """
+        if self.wire_quantization == "int8":
+            return self._int8_fields(np.asarray(vector)[None], None if scale is None else [scale])[0]
+        
+        vector = self._vector_payload(vector, scale)
+        if not self.binary_vectors:
+            return {"vector": vector}
+        return {"vector_f32": np.asarray(vector, dtype="<f4").tobytes()}
+    
+    def _int8_fields(self, embeddings: np.ndarray,
+                     scales: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Build int8 vector fields for each row of an embedding matrix.
+        
+        Embeddings that are already int8 with scales (symmetric, as made
+        by EmbeddingService) are sent as they are with a zero point of 0;
+        anything else is quantized with quantize_int8.
+        """
+        if embeddings.dtype == np.int8 and scales is not None:
+            quantized = embeddings
+            scales = np.asarray(scales, dtype=np.float32)
+            zero_points = np.zeros(len(embeddings), dtype=np.int32)
+        else:
+            matrix = embeddings.astype(np.float32)
+            if scales is not None:
+                matrix *= np.asarray(scales, dtype=np.float32)[:, None]
+            quantized, scales, zero_points = quantize_int8(matrix)
+        
+        return [
+            {"vector_q8": row.tobytes(), "scale": scale, "zp": zero_point}
+            for row, scale, zero_point in zip(quantized, scales.tolist(), zero_points.tolist())
+        ]
+    
+    def _vector_entries(self, vectors_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert vector data into Endee insert entries, generating missing ids."""
+        return [
+            {
+                "id": data.get("id") or uuid.uuid4().hex,
+                **self._vector_field(data["embedding"], data.get("embedding_scale")),
+                "metadata": data.get("metadata") or {}
+            }
+            for data in vectors_data
+        ]
+    
+    def _bulk_vector_entries(self, ids: List[str], embeddings: np.ndarray,
+                             metadata: List[Dict[str, Any]],
+                             scales: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Build Endee insert entries from column-wise vector data."""
+        if self.wire_quantization == "int8":
+            fields = self._int8_fields(embeddings, scales)
+            return [
+                {"id": vector_id, **field, "metadata": meta}
+                for vector_id, field, meta in zip(ids, fields, metadata)
+            ]
+        
+        matrix = embeddings.astype(np.float32)
+        if scales is not None:
+            matrix *= np.asarray(scales, dtype=np.float32)[:, None]
+        
+        if self.binary_vectors:
+            # Serialize the matrix once and hand out per-row slices
+            raw = matrix.astype("<f4", copy=False).tobytes()
+            row_bytes = matrix.shape[1] * 4
+            fields = [{"vector_f32": raw[i:i + row_bytes]} for i in range(0, len(raw), row_bytes)]
+        else:
+            fields = [{"vector": row} for row in matrix]
+        
+        return [
+            {"id": vector_id, **field, "metadata": meta}
+            for vector_id, field, meta in zip(ids, fields, metadata)
+        ]
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async HTTP client, creating it on first use.
+        
+        Pooled connections are bound to the loop that opened them, so this
+        is only called on the background loop (see _arequest).
+        """
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(**self._client_options())
+        return self._aclient
+    
+    async def _arequest(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a request over the shared connection pool, from any event loop."""
+        async def send() -> httpx.Response:
+            return await self._get_async_client().request(method, path, **kwargs)
+        
+        # The response body is read on the background loop, so the
+        # returned response can be used from the caller's loop
+        return await self._runner.run_async(send())
+    
+    def _run_sync(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the background loop used by the sync methods."""
+        return self._runner.run(coro)
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client and stop the background loop."""
+        if self._runner.running:
+            self._runner.run(self._aclose_client())
+            self._runner.stop()
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client; later requests open a new one."""
+        if self._runner.running:
+            await self._runner.run_async(self._aclose_client())
+    
+    async def _aclose_client(self) -> None:
+        """Close the pooled HTTP client (on the background loop)."""
+        client, self._aclient = self._aclient, None
+        if client is not None:
+            await client.aclose()
+    
     async def health_check(self) -> bool:
         """
         Check if Endee database is healthy and accessible.
         
+        The result is reused for HEALTH_CHECK_TTL seconds.
+        
         Returns:
             True if healthy, False otherwise
         """
+        cached = self._cached_health()
+        if cached is not None:
+            return cached
+        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/health",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                return response.status_code == 200
+            response = await self._arequest(
+                "GET",
+                "/health",
+                timeout=10.0
+            )
+            return self._record_health(response.status_code == 200)
         except Exception as e:
             logger.error(f"Health check failed: {e}")
-            return False
+            return self._record_health(False)
     
     def health_check_sync(self) -> bool:
         """Synchronous version of health check."""
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/health",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            return False
+        return self._run_sync(self.health_check())
+    
+    def _collection_path(self, collection_name: str, endpoint: str) -> str:
+        """Get the request path of a collection endpoint, e.g. its vectors."""
+        key = (collection_name, endpoint)
+        path = self._paths.get(key)
+        if path is None:
+            # Names are escaped so they can't change the path structure
+            path = self._paths[key] = f"/collections/{quote(collection_name, safe='')}/{endpoint}"
+        return path
+    
+    def _cached_health(self) -> Optional[bool]:
+        """Return the last health check result if it is recent enough."""
+        if self._health is not None and time.monotonic() - self._health_checked_at < self.HEALTH_CHECK_TTL:
+            return self._health
+        return None
+    
+    def _record_health(self, healthy: bool) -> bool:
+        """Remember a health check result."""
+        self._health = healthy
+        self._health_checked_at = time.monotonic()
+        return healthy
     
     async def create_collection(self, collection_name: str, dimension: int) -> bool:
         """
@@ -81,59 +568,32 @@ class EndeeClient:
                 "dimension": dimension,
                 "metric": "cosine"  # Use cosine similarity
             }
+            if self.wire_quantization == "int8":
+                payload["quantization"] = "int8"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/collections",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30.0
-                )
+            response = await self._apost(
+                "/collections",
+                payload,
+                timeout=30.0
+            )
+            
+            if response.status_code in [200, 201]:
+                logger.info(f"Collection '{collection_name}' created successfully")
+                return True
+            elif response.status_code == 409:
+                logger.info(f"Collection '{collection_name}' already exists")
+                return True
+            else:
+                logger.error(f"Failed to create collection: {response.status_code} - {response.text}")
+                return False
                 
-                if response.status_code in [200, 201]:
-                    logger.info(f"Collection '{collection_name}' created successfully")
-                    return True
-                elif response.status_code == 409:
-                    logger.info(f"Collection '{collection_name}' already exists")
-                    return True
-                else:
-                    logger.error(f"Failed to create collection: {response.status_code} - {response.text}")
-                    return False
-                    
         except Exception as e:
             logger.error(f"Error creating collection: {e}")
             return False
     
     def create_collection_sync(self, collection_name: str, dimension: int) -> bool:
         """Synchronous version of create_collection."""
-        try:
-            payload = {
-                "name": collection_name,
-                "dimension": dimension,
-                "metric": "cosine"
-            }
-            
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{self.base_url}/collections",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30.0
-                )
-                
-                if response.status_code in [200, 201]:
-                    logger.info(f"Collection '{collection_name}' created successfully")
-                    return True
-                elif response.status_code == 409:
-                    logger.info(f"Collection '{collection_name}' already exists")
-                    return True
-                else:
-                    logger.error(f"Failed to create collection: {response.status_code} - {response.text}")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Error creating collection: {e}")
-            return False
+        return self._run_sync(self.create_collection(collection_name, dimension))
     
     async def insert_vectors(self, collection_name: str, vectors_data: List[Dict[str, Any]]) -> bool:
         """
@@ -147,74 +607,69 @@ class EndeeClient:
             True if successful, False otherwise
         """
         try:
-            # Prepare vectors for Endee format
-            vectors = []
-            for data in vectors_data:
-                vector_entry = {
-                    "id": data.get("id", str(uuid.uuid4())),
-                    "vector": data["embedding"],
-                    "metadata": data.get("metadata", {})
-                }
-                vectors.append(vector_entry)
-            
-            payload = {
-                "vectors": vectors
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/collections/{collection_name}/vectors",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=60.0
-                )
+            vectors = self._vector_entries(vectors_data)
+            return await self._ainsert_entries(collection_name, vectors)
                 
-                if response.status_code in [200, 201]:
-                    logger.info(f"Successfully inserted {len(vectors)} vectors into '{collection_name}'")
-                    return True
-                else:
-                    logger.error(f"Failed to insert vectors: {response.status_code} - {response.text}")
-                    return False
-                    
         except Exception as e:
             logger.error(f"Error inserting vectors: {e}")
             return False
     
     def insert_vectors_sync(self, collection_name: str, vectors_data: List[Dict[str, Any]]) -> bool:
         """Synchronous version of insert_vectors."""
-        try:
-            vectors = []
-            for data in vectors_data:
-                vector_entry = {
-                    "id": data.get("id", str(uuid.uuid4())),
-                    "vector": data["embedding"],
-                    "metadata": data.get("metadata", {})
-                }
-                vectors.append(vector_entry)
-            
-            payload = {
-                "vectors": vectors
-            }
+        return self._run_sync(self.insert_vectors(collection_name, vectors_data))
+    
+    async def insert_vectors_bulk(self, collection_name: str, ids: List[str], embeddings: np.ndarray,
+                                  metadata: List[Dict[str, Any]],
+                                  scales: Optional[np.ndarray] = None) -> bool:
+        """
+        Insert vectors given as columns rather than one dictionary per vector.
+        
+        The whole embedding matrix is converted to float32 (and to bytes,
+        with binary_vectors) in one operation instead of once per vector.
+        
+        Args:
+            collection_name: Name of the collection
+            ids: Vector ids
+            embeddings: (n, dimension) array of possibly quantized vectors
+            metadata: Metadata dictionary for each vector
+            scales: Per-vector scales of int8 embeddings
             
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{self.base_url}/collections/{collection_name}/vectors",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=60.0
-                )
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            vectors = self._bulk_vector_entries(ids, embeddings, metadata, scales)
+            return await self._ainsert_entries(collection_name, vectors)
                 
-                if response.status_code in [200, 201]:
-                    logger.info(f"Successfully inserted {len(vectors)} vectors into '{collection_name}'")
-                    return True
-                else:
-                    logger.error(f"Failed to insert vectors: {response.status_code} - {response.text}")
-                    return False
-                    
         except Exception as e:
             logger.error(f"Error inserting vectors: {e}")
             return False
     
+    def insert_vectors_bulk_sync(self, collection_name: str, ids: List[str], embeddings: np.ndarray,
+                                 metadata: List[Dict[str, Any]],
+                                 scales: Optional[np.ndarray] = None) -> bool:
+        """Synchronous version of insert_vectors_bulk."""
+        return self._run_sync(self.insert_vectors_bulk(collection_name, ids, embeddings, metadata, scales))
+    
+    async def _ainsert_entries(self, collection_name: str, vectors: List[Dict[str, Any]]) -> bool:
+        """POST prepared vector entries to a collection."""
+        response = await self._apost(
+            self._collection_path(collection_name, "vectors"),
+            {"vectors": vectors},
+            timeout=60.0
+        )
+        return self._check_insert(collection_name, response, len(vectors))
+    
+    @staticmethod
+    def _check_insert(collection_name: str, response: httpx.Response, count: int) -> bool:
+        """Log the outcome of an insert request."""
+        if response.status_code in [200, 201]:
+            logger.info(f"Successfully inserted {count} vectors into '{collection_name}'")
+            return True
+        
+        logger.error(f"Failed to insert vectors: {response.status_code} - {response.text}")
+        return False
+    
     async def search_vectors(self, collection_name: str, query_vector: List[float], 
                            top_k: int = 5, threshold: float = 0.0) -> List[Dict[str, Any]]:
         """
@@ -231,27 +686,24 @@ class EndeeClient:
         """
         try:
             payload = {
-                "vector": query_vector,
+                "vector": self._vector_payload(query_vector),
                 "top_k": top_k,
                 "threshold": threshold
             }
+            response = await self._apost(
+                self._collection_path(collection_name, "search"),
+                payload,
+                timeout=30.0
+            )
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/collections/{collection_name}/search",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30.0
-                )
+            if response.status_code == 200:
+                results = self._decode_body(response)
+                logger.info(f"Found {len(results.get('results', []))} similar vectors")
+                return results.get('results', [])
+            else:
+                logger.error(f"Search failed: {response.status_code} - {response.text}")
+                return []
                 
-                if response.status_code == 200:
-                    results = response.json()
-                    logger.info(f"Found {len(results.get('results', []))} similar vectors")
-                    return results.get('results', [])
-                else:
-                    logger.error(f"Search failed: {response.status_code} - {response.text}")
-                    return []
-                    
         except Exception as e:
             logger.error(f"Error searching vectors: {e}")
             return []
@@ -259,33 +711,151 @@ class EndeeClient:
     def search_vectors_sync(self, collection_name: str, query_vector: List[float], 
                           top_k: int = 5, threshold: float = 0.0) -> List[Dict[str, Any]]:
         """Synchronous version of search_vectors."""
+        return self._run_sync(self.search_vectors(collection_name, query_vector, top_k, threshold))
+    
+    async def search_vectors_stream(self, collection_name: str, query_vector: List[float],
+                                    top_k: int = 5, threshold: float = 0.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search for similar vectors, yielding results as they arrive.
+        
+        Asks for newline-delimited JSON so each result can be used before
+        the rest of the response is received. Servers that answer with a
+        regular JSON body still work; their results are yielded once the
+        body is complete.
+        
+        Args:
+            collection_name: Name of the collection
+            query_vector: Query vector for similarity search
+            top_k: Number of top results to return
+            threshold: Minimum similarity threshold
+            
+        Yields:
+            Similar vectors with metadata and scores, best first
+        """
+        caller_loop = asyncio.get_running_loop()
+        results: asyncio.Queue = asyncio.Queue()
+        
+        def hand_off(result: Optional[Dict[str, Any]]) -> None:
+            if not caller_loop.is_closed():
+                caller_loop.call_soon_threadsafe(results.put_nowait, result)
+        
+        async def produce() -> None:
+            # Runs on the background loop that owns the connection pool;
+            # each result is handed to the caller's loop, then None at the end
+            try:
+                async for result in self._astream_search(collection_name, query_vector, top_k, threshold):
+                    hand_off(result)
+            finally:
+                hand_off(None)
+        
+        producer = asyncio.ensure_future(self._runner.run_async(produce()))
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+        finally:
+            producer.cancel()
+    
+    async def _astream_search(self, collection_name: str, query_vector: List[float],
+                              top_k: int, threshold: float) -> AsyncIterator[Dict[str, Any]]:
+        """Stream search results; runs on the background loop (see search_vectors_stream)."""
         try:
             payload = {
-                "vector": query_vector,
+                "vector": self._vector_payload(query_vector),
                 "top_k": top_k,
                 "threshold": threshold
             }
+            body, headers = self._encode_body(payload)
+            headers["Accept"] = f"{NDJSON_CONTENT_TYPE}, application/json"
             
-            with httpx.Client() as client:
-                response = client.post(
-                    f"{self.base_url}/collections/{collection_name}/search",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    results = response.json()
-                    logger.info(f"Found {len(results.get('results', []))} similar vectors")
-                    return results.get('results', [])
-                else:
+            client = self._get_async_client()
+            async with client.stream(
+                "POST",
+                self._collection_path(collection_name, "search"),
+                headers=headers,
+                content=body,
+                timeout=30.0
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
                     logger.error(f"Search failed: {response.status_code} - {response.text}")
-                    return []
-                    
+                    return
+                
+                if not response.headers.get("Content-Type", "").startswith(NDJSON_CONTENT_TYPE):
+                    await response.aread()
+                    for result in self._decode_body(response).get('results', []):
+                        yield result
+                    return
+                
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        yield _loads(line)
+                
         except Exception as e:
-            logger.error(f"Error searching vectors: {e}")
+            logger.error(f"Error streaming search results: {e}")
+    
+    async def search_vectors_batch(self, collection_name: str, query_vectors: np.ndarray,
+                                   top_k: int = 5, threshold: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar vectors for many queries in a single request.
+        
+        Args:
+            collection_name: Name of the collection
+            query_vectors: (n_queries, dimension) array of query vectors
+            top_k: Number of top results to return per query
+            threshold: Minimum similarity threshold
+            
+        Returns:
+            One list of similar vectors with metadata and scores per query
+        """
+        try:
+            payload = self._batch_search_payload(query_vectors, top_k, threshold)
+            response = await self._apost(
+                self._collection_path(collection_name, "search_batch"),
+                payload,
+                timeout=60.0
+            )
+            
+            if response.status_code == 200:
+                results = self._decode_body(response).get('results', [])
+                logger.info(f"Batch search returned results for {len(results)} queries")
+                return results
+            else:
+                logger.error(f"Batch search failed: {response.status_code} - {response.text}")
+                return []
+                
+        except Exception as e:
+            logger.error(f"Error batch searching vectors: {e}")
             return []
     
+    def search_vectors_batch_sync(self, collection_name: str, query_vectors: np.ndarray,
+                                  top_k: int = 5, threshold: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """Synchronous version of search_vectors_batch."""
+        return self._run_sync(self.search_vectors_batch(collection_name, query_vectors, top_k, threshold))
+    
+    def _batch_search_payload(self, query_vectors: np.ndarray, top_k: int,
+                              threshold: float) -> Dict[str, Any]:
+        """
+        Build a search_batch request body.
+        
+        With binary_vectors enabled all queries are sent as one float32
+        buffer under "vectors_f32", with "dimension" giving the row length;
+        otherwise "vectors" is a list of number arrays.
+        """
+        query_vectors = np.asarray(query_vectors, dtype="<f4")
+        if self.binary_vectors:
+            vectors = {
+                "vectors_f32": np.ascontiguousarray(query_vectors).tobytes(),
+                "dimension": query_vectors.shape[1]
+            }
+        else:
+            vectors = {"vectors": query_vectors}
+        
+        return {
+            **vectors,
+            "top_k": top_k,
+            "threshold": threshold
+        }
+    
     async def list_collections(self) -> List[str]:
         """
         List all collections in Endee.
@@ -294,44 +864,116 @@ class EndeeClient:
             List of collection names
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/collections",
-                    headers=self.headers,
-                    timeout=10.0
-                )
+            response = await self._arequest(
+                "GET",
+                "/collections",
+                timeout=10.0
+            )
+            
+            if response.status_code == 200:
+                collections = self._decode_body(response)
+                return [col.get('name', '') for col in collections.get('collections', [])]
+            else:
+                logger.error(f"Failed to list collections: {response.status_code}")
+                return []
                 
-                if response.status_code == 200:
-                    collections = response.json()
-                    return [col.get('name', '') for col in collections.get('collections', [])]
-                else:
-                    logger.error(f"Failed to list collections: {response.status_code}")
-                    return []
-                    
         except Exception as e:
             logger.error(f"Error listing collections: {e}")
             return []
     
     def list_collections_sync(self) -> List[str]:
         """Synchronous version of list_collections."""
-        try:
-            with httpx.Client() as client:
-                response = client.get(
-                    f"{self.base_url}/collections",
-                    headers=self.headers,
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    collections = response.json()
-                    return [col.get('name', '') for col in collections.get('collections', [])]
-                else:
-                    logger.error(f"Failed to list collections: {response.status_code}")
-                    return []
-                    
-        except Exception as e:
-            logger.error(f"Error listing collections: {e}")
-            return []
+        return self._run_sync(self.list_collections())
+
+
+class InsertRing:
+    """
+    Submission/completion queues for insert requests.
+    
+    Inserts are submitted without waiting for them; a worker task drains
+    up to `max_batch` submissions at a time, runs them concurrently, and
+    queues each outcome for reap(). Submitting blocks only once
+    `max_pending` inserts are waiting, which bounds the memory held by
+    unsent vectors.
+    """
+    
+    def __init__(self, max_batch: int = 8, max_pending: int = 32):
+        self.max_batch = max_batch
+        self._submissions: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._completions: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.reaped = 0
+    
+    async def submit(self, insert: Awaitable[bool], tag: Any = None) -> None:
+        """
+        Queue an insert request, starting the worker on first use.
+        
+        Args:
+            insert: Awaitable returning True if the insert succeeded, such as
+                EndeeClient.insert_vectors(...)
+            tag: Value returned with the insert's outcome by reap()
+        """
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        await self._submissions.put((insert, tag))
+        self.submitted += 1
+    
+    async def reap(self, count: int = 1) -> List[Tuple[Any, bool]]:
+        """
+        Wait for `count` completed inserts.
+        
+        Returns:
+            (tag, success) for each insert, in completion order
+        """
+        completions = []
+        for _ in range(count):
+            completions.append(await self._completions.get())
+        self.reaped += count
+        return completions
+    
+    def reap_ready(self) -> List[Tuple[Any, bool]]:
+        """Return the inserts completed so far without waiting."""
+        completions = []
+        while not self._completions.empty():
+            completions.append(self._completions.get_nowait())
+        self.reaped += len(completions)
+        return completions
+    
+    async def drain(self) -> List[Tuple[Any, bool]]:
+        """Wait for every submitted insert that has not been reaped yet."""
+        return await self.reap(self.submitted - self.reaped)
+    
+    async def aclose(self) -> None:
+        """Stop the worker; inserts not yet started are dropped."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        
+        while not self._submissions.empty():
+            insert, _ = self._submissions.get_nowait()
+            if asyncio.iscoroutine(insert):
+                insert.close()
+    
+    async def _run(self) -> None:
+        """Run queued inserts, up to max_batch at a time."""
+        while True:
+            submissions = [await self._submissions.get()]
+            while len(submissions) < self.max_batch and not self._submissions.empty():
+                submissions.append(self._submissions.get_nowait())
+            
+            results = await asyncio.gather(
+                *(insert for insert, _ in submissions), return_exceptions=True
+            )
+            for (_, tag), result in zip(submissions, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Insert request failed: {result}")
+                    result = False
+                self._completions.put_nowait((tag, result))
 
 
 class VectorStore:
@@ -370,48 +1012,177 @@ class VectorStore:
             logger.error(f"Failed to initialize vector store: {e}")
             return False
     
-    def store_document_chunks(self, chunks_with_embeddings: List[Dict[str, Any]]) -> bool:
+    def store_document_chunks(self, chunks_with_embeddings: List[Dict[str, Any]],
+                              batch_size: int = 128) -> bool:
         """
         Store document chunks with embeddings in the vector database.
         
+        Synchronous wrapper around astore_document_chunks.
+        
         Args:
             chunks_with_embeddings: List of chunks with embeddings from embedding service
+            batch_size: Maximum number of vectors sent per insert request
             
         Returns:
             True if successful, False otherwise
         """
+        return self.client._run_sync(self.astore_document_chunks(chunks_with_embeddings, batch_size))
+    
+    async def astore_document_chunks(self, chunks_with_embeddings: List[Dict[str, Any]],
+                                     batch_size: int = 128) -> bool:
+        """
+        Store document chunks with concurrent insert requests.
+        
+        The chunks are split into batches of `batch_size` vectors which are
+        inserted at the same time over the pooled async client, so at most
+        the pool's connection limit are in flight at once.
+        
+        Args:
+            chunks_with_embeddings: List of chunks with embeddings from embedding service
+            batch_size: Maximum number of vectors sent per insert request
+            
+        Returns:
+            True if every batch was stored, False otherwise
+        """
         if not self.initialized:
             logger.error("Vector store not initialized")
             return False
         
         try:
-            # Prepare data for Endee
-            vectors_data = []
-            for chunk in chunks_with_embeddings:
-                vector_data = {
-                    "id": f"{chunk['metadata']['source']}_{chunk['chunk_id']}",
-                    "embedding": chunk["embedding"],
-                    "metadata": {
-                        **chunk["metadata"],
-                        "text": chunk["text"],
-                        "created_at": datetime.utcnow().isoformat(),
-                        "embedding_model": chunk.get("embedding_model", "unknown")
-                    }
-                }
-                vectors_data.append(vector_data)
-            
-            # Insert vectors
-            success = self.client.insert_vectors_sync(self.collection_name, vectors_data)
+            vectors = iter(self._prepare_vectors(chunks_with_embeddings))
+            batches = list(iter(lambda: list(islice(vectors, batch_size)), []))
             
-            if success:
-                logger.info(f"Stored {len(vectors_data)} document chunks in vector database")
+            return await self._gather_inserts(
+                [self.client.insert_vectors(self.collection_name, batch) for batch in batches],
+                len(chunks_with_embeddings)
+            )
             
-            return success
+        except Exception as e:
+            logger.error(f"Failed to store document chunks: {e}")
+            return False
+    
+    def store_chunk_batch(self, batch: "ChunkBatch", batch_size: int = 128) -> bool:
+        """
+        Store a column-wise batch of embedded chunks.
+        
+        Synchronous wrapper around astore_chunk_batch.
+        
+        Args:
+            batch: Embedded chunks from EmbeddingService.iter_chunk_batches
+            batch_size: Maximum number of vectors sent per insert request
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.client._run_sync(self.astore_chunk_batch(batch, batch_size))
+    
+    async def astore_chunk_batch(self, batch: "ChunkBatch", batch_size: int = 128) -> bool:
+        """
+        Store a column-wise batch of embedded chunks with concurrent inserts.
+        
+        Unlike astore_document_chunks, the embeddings stay in one matrix,
+        which is sliced per insert request rather than split per chunk.
+        
+        Args:
+            batch: Embedded chunks from EmbeddingService.iter_chunk_batches
+            batch_size: Maximum number of vectors sent per insert request
+            
+        Returns:
+            True if every insert request succeeded, False otherwise
+        """
+        if not self.initialized:
+            logger.error("Vector store not initialized")
+            return False
+        
+        try:
+            inserts = self._chunk_batch_inserts(batch, batch_size)
+            return await self._gather_inserts(inserts, len(batch))
             
         except Exception as e:
             logger.error(f"Failed to store document chunks: {e}")
             return False
     
+    async def submit_chunk_batch(self, ring: InsertRing, batch: "ChunkBatch",
+                                 batch_size: int = 128) -> int:
+        """
+        Submit a column-wise batch of embedded chunks to an insert ring.
+        
+        Returns as soon as the inserts are queued; their outcomes are
+        collected with ring.reap(), tagged with the number of chunks each
+        insert carries.
+        
+        Args:
+            ring: Ring that runs the insert requests
+            batch: Embedded chunks from EmbeddingService.aiter_chunk_batches
+            batch_size: Maximum number of vectors sent per insert request
+            
+        Returns:
+            Number of inserts submitted
+        """
+        if not self.initialized:
+            raise RuntimeError("Vector store not initialized")
+        
+        inserts = self._chunk_batch_inserts(batch, batch_size)
+        for start, insert in zip(range(0, len(batch), batch_size), inserts):
+            await ring.submit(insert, tag=min(batch_size, len(batch) - start))
+        return len(inserts)
+    
+    def _chunk_batch_inserts(self, batch: "ChunkBatch", batch_size: int) -> List[Awaitable[bool]]:
+        """Build one insert request per `batch_size` rows of a chunk batch."""
+        created_at = datetime.utcnow().isoformat()
+        ids = [f"{meta['source']}_{chunk_id}" for meta, chunk_id in zip(batch.metadata, batch.chunk_ids)]
+        metadata = [
+            dict(meta, text=text, created_at=created_at, embedding_model=batch.model)
+            for meta, text in zip(batch.metadata, batch.texts)
+        ]
+        
+        inserts = []
+        for start in range(0, len(batch), batch_size):
+            stop = start + batch_size
+            inserts.append(self.client.insert_vectors_bulk(
+                self.collection_name,
+                ids[start:stop],
+                batch.embeddings[start:stop],
+                metadata[start:stop],
+                None if batch.scales is None else batch.scales[start:stop]
+            ))
+        return inserts
+    
+    async def _gather_inserts(self, inserts: List[Awaitable[bool]], count: int) -> bool:
+        """Run insert requests concurrently and log the overall outcome."""
+        results = await asyncio.gather(*inserts)
+        
+        success = all(results)
+        if success:
+            logger.info(f"Stored {count} document chunks in vector database")
+        else:
+            logger.error(f"{results.count(False)} of {len(results)} insert batches failed")
+        
+        return success
+    
+    def _prepare_vectors(self, chunks_with_embeddings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert chunks with embeddings into Endee vector entries."""
+        # One timestamp for the whole call rather than one clock read per chunk
+        created_at = datetime.utcnow().isoformat()
+        
+        # Ids are plain f-strings: building them with np.char over column
+        # arrays is slower, since the columns must first be gathered from
+        # the chunk dicts and converted back to Python strings
+        return [
+            {
+                "id": f"{chunk['metadata']['source']}_{chunk['chunk_id']}",
+                "embedding": chunk["embedding"],
+                "embedding_scale": chunk.get("embedding_scale"),
+                "metadata": dict(
+                    chunk["metadata"],
+                    text=chunk["text"],
+                    created_at=created_at,
+                    embedding_model=chunk.get("embedding_model", "unknown")
+                )
+            }
+            for chunk in chunks_with_embeddings
+        ]
+    
     def search_similar_chunks(self, query_embedding: List[float], 
                             top_k: int = 5, threshold: float = 0.0) -> List[Dict[str, Any]]:
         """
@@ -434,22 +1205,96 @@ class VectorStore:
                 self.collection_name, query_embedding, top_k, threshold
             )
             
-            # Format results for easier use
-            formatted_results = []
-            for result in results:
-                formatted_result = {
-                    "id": result.get("id"),
-                    "score": result.get("score", 0.0),
-                    "text": result.get("metadata", {}).get("text", ""),
-                    "source": result.get("metadata", {}).get("source", ""),
-                    "page": result.get("metadata", {}).get("page", 0),
-                    "chunk_index": result.get("metadata", {}).get("chunk_index", 0),
-                    "metadata": result.get("metadata", {})
-                }
-                formatted_results.append(formatted_result)
-            
-            return formatted_results
+            return self._format_results(results)
+            
+        except Exception as e:
+            logger.error(f"Failed to search similar chunks: {e}")
+            return []
+    
+    async def asearch_similar_chunks(self, query_embedding: List[float], 
+                                     top_k: int = 5, threshold: float = 0.0) -> List[Dict[str, Any]]:
+        """Async version of search_similar_chunks."""
+        if not self.initialized:
+            logger.error("Vector store not initialized")
+            return []
+        
+        try:
+            results = await self.client.search_vectors(
+                self.collection_name, query_embedding, top_k, threshold
+            )
+            
+            return self._format_results(results)
             
         except Exception as e:
             logger.error(f"Failed to search similar chunks: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    async def asearch_similar_chunks_stream(self, query_embedding: List[float], top_k: int = 5,
+                                            threshold: float = 0.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search for similar document chunks, yielding each as it arrives.
+        
+        Callers can start working on the best match (e.g. reranking)
+        before the remaining results have been received.
+        
+        Args:
+            query_embedding: Query vector for similarity search
+            top_k: Number of top results to return
+            threshold: Minimum similarity threshold
+            
+        Yields:
+            Similar chunks with metadata and scores
+        """
+        if not self.initialized:
+            logger.error("Vector store not initialized")
+            return
+        
+        async for result in self.client.search_vectors_stream(
+            self.collection_name, query_embedding, top_k, threshold
+        ):
+            yield self._format_result(result)
+    
+    def search_similar_chunks_batch(self, query_embeddings: np.ndarray,
+                                    top_k: int = 5, threshold: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar document chunks for many queries in one request.
+        
+        Args:
+            query_embeddings: (n_queries, dimension) array of query vectors
+            top_k: Number of top results to return per query
+            threshold: Minimum similarity threshold
+            
+        Returns:
+            One list of similar chunks per query, in query order
+        """
+        if not self.initialized:
+            logger.error("Vector store not initialized")
+            return []
+        
+        try:
+            results = self.client.search_vectors_batch_sync(
+                self.collection_name, query_embeddings, top_k, threshold
+            )
+            
+            return [self._format_results(query_results) for query_results in results]
+            
+        except Exception as e:
+            logger.error(f"Failed to batch search similar chunks: {e}")
+            return []
+    
+    def _format_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Format raw Endee search results for easier use."""
+        return [self._format_result(result) for result in results]
+    
+    def _format_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a single raw Endee search result."""
+        metadata = result.get("metadata") or {}
+        return {
+            "id": result.get("id"),
+            "score": result.get("score", 0.0),
+            "text": metadata.get("text", ""),
+            "source": metadata.get("source", ""),
+            "page": metadata.get("page", 0),
+            "chunk_index": metadata.get("chunk_index", 0),
+            "metadata": metadata
+        }
\ No newline at end of file
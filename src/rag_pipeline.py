@@ -1,15 +1,18 @@
 """Main RAG pipeline that orchestrates document processing, embedding, and storage."""
 
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 import uuid
 from datetime import datetime
 
-from .config import settings
+from .config import Settings, get_settings
 from .document_processor import DocumentProcessor
-from .embedding_service import EmbeddingService
-from .endee_client import EndeeClient, VectorStore
+from .embedding_service import EmbeddingService, SemanticCache
+from .endee_client import EndeeClient, InsertRing, VectorStore
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +20,16 @@ logger = logging.getLogger(__name__)
 class RAGPipeline:
     """Main pipeline for RAG document processing and storage."""
     
-    def __init__(self):
-        """Initialize the RAG pipeline with all components."""
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the RAG pipeline with all components.
+        
+        Args:
+            settings: Settings to use instead of the shared get_settings() instance
+        """
+        settings = settings or get_settings()
+        self.settings = settings
+        
         self.document_processor = DocumentProcessor(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap
@@ -26,12 +37,23 @@ class RAGPipeline:
         
         self.embedding_service = EmbeddingService(
             api_key=settings.openai_api_key,
-            model=settings.openai_model
+            model=settings.openai_model,
+            cache_size=settings.embedding_cache_size,
+            redis_url=settings.redis_url,
+            cache_ttl=settings.embedding_cache_ttl,
+            quantization=settings.embedding_quantization,
+            cache_path=settings.embedding_cache_path
         )
         
         self.endee_client = EndeeClient(
             base_url=settings.endee_url,
-            auth_token=settings.endee_auth_token
+            auth_token=settings.endee_auth_token,
+            compress_requests=settings.endee_compress_requests,
+            use_msgpack=settings.endee_use_msgpack,
+            binary_vectors=settings.endee_binary_vectors,
+            compression=settings.endee_compression,
+            http2=settings.endee_http2,
+            wire_quantization=settings.endee_wire_quantization
         )
         
         self.vector_store = VectorStore(
@@ -39,6 +61,12 @@ class RAGPipeline:
             collection_name="documents"
         )
         
+        # Search results for recent queries, reused for near-duplicate queries
+        self.query_cache = SemanticCache(
+            threshold=settings.semantic_cache_threshold,
+            capacity=settings.semantic_cache_size
+        )
+        
         self.initialized = False
     
     def initialize(self) -> bool:
@@ -83,30 +111,10 @@ class RAGPipeline:
         try:
             logger.info(f"Processing PDF file: {file_path}")
             
-            # Step 1: Extract text from PDF
-            logger.info("Step 1: Extracting text from PDF...")
-            document_data = self.document_processor.extract_text_from_pdf(file_path)
-            
-            if not document_data["content"]:
-                raise ValueError("No text content extracted from PDF")
-            
-            # Step 2: Split into chunks
-            logger.info("Step 2: Splitting text into chunks...")
-            chunks = self.document_processor.split_text_into_chunks(document_data)
-            
-            if not chunks:
-                raise ValueError("No chunks created from document")
-            
-            # Step 3: Generate embeddings
-            logger.info("Step 3: Generating embeddings...")
-            chunks_with_embeddings = self.embedding_service.generate_embeddings_for_chunks(chunks)
-            
-            # Step 4: Store in vector database
-            logger.info("Step 4: Storing in vector database...")
-            storage_success = self.vector_store.store_document_chunks(chunks_with_embeddings)
-            
-            if not storage_success:
-                raise RuntimeError("Failed to store chunks in vector database")
+            # Pages are extracted, chunked, embedded and stored as a stream,
+            # so only the current batch of chunks is held in memory
+            metadata = {}
+            total_chunks = self._ingest_stream(file_path, metadata)
             
             # Prepare result
             result = {
@@ -116,13 +124,13 @@ class RAGPipeline:
                 "filename": Path(file_path).name,
                 "processed_at": datetime.utcnow().isoformat(),
                 "statistics": {
-                    "total_pages": document_data["metadata"]["total_pages"],
-                    "total_chunks": len(chunks),
-                    "extraction_method": document_data["metadata"]["extraction_method"],
+                    "total_pages": metadata["total_pages"],
+                    "total_chunks": total_chunks,
+                    "extraction_method": metadata["extraction_method"],
                     "embedding_model": self.embedding_service.model,
                     "embedding_dimension": self.embedding_service.embedding_dimension
                 },
-                "chunks_stored": len(chunks_with_embeddings)
+                "chunks_stored": total_chunks
             }
             
             logger.info(f"Successfully processed PDF: {result['statistics']}")
@@ -142,7 +150,7 @@ class RAGPipeline:
         Process PDF from bytes (for uploaded files).
         
         Args:
-            pdf_bytes: PDF file content as bytes
+            pdf_bytes: PDF file content as bytes (or a read-only mmap)
             filename: Original filename
             
         Returns:
@@ -154,30 +162,10 @@ class RAGPipeline:
         try:
             logger.info(f"Processing PDF bytes: {filename}")
             
-            # Step 1: Extract text from PDF bytes
-            logger.info("Step 1: Extracting text from PDF bytes...")
-            document_data = self.document_processor.extract_text_from_bytes(pdf_bytes, filename)
-            
-            if not document_data["content"]:
-                raise ValueError("No text content extracted from PDF")
-            
-            # Step 2: Split into chunks
-            logger.info("Step 2: Splitting text into chunks...")
-            chunks = self.document_processor.split_text_into_chunks(document_data)
-            
-            if not chunks:
-                raise ValueError("No chunks created from document")
-            
-            # Step 3: Generate embeddings
-            logger.info("Step 3: Generating embeddings...")
-            chunks_with_embeddings = self.embedding_service.generate_embeddings_for_chunks(chunks)
-            
-            # Step 4: Store in vector database
-            logger.info("Step 4: Storing in vector database...")
-            storage_success = self.vector_store.store_document_chunks(chunks_with_embeddings)
-            
-            if not storage_success:
-                raise RuntimeError("Failed to store chunks in vector database")
+            # Pages are extracted, chunked, embedded and stored as a stream,
+            # so only the current batch of chunks is held in memory
+            metadata = {"source": filename}
+            total_chunks = self._ingest_stream(pdf_bytes, metadata)
             
             # Prepare result
             result = {
@@ -186,13 +174,13 @@ class RAGPipeline:
                 "filename": filename,
                 "processed_at": datetime.utcnow().isoformat(),
                 "statistics": {
-                    "total_pages": document_data["metadata"]["total_pages"],
-                    "total_chunks": len(chunks),
-                    "extraction_method": document_data["metadata"]["extraction_method"],
+                    "total_pages": metadata["total_pages"],
+                    "total_chunks": total_chunks,
+                    "extraction_method": metadata["extraction_method"],
                     "embedding_model": self.embedding_service.model,
                     "embedding_dimension": self.embedding_service.embedding_dimension
                 },
-                "chunks_stored": len(chunks_with_embeddings)
+                "chunks_stored": total_chunks
             }
             
             logger.info(f"Successfully processed PDF bytes: {result['statistics']}")
@@ -207,6 +195,87 @@ class RAGPipeline:
                 "processed_at": datetime.utcnow().isoformat()
             }
     
+    def _ingest_stream(self, source, metadata: Dict[str, Any]) -> int:
+        """
+        Extract, chunk, embed and store a PDF one batch of chunks at a time.
+        
+        Synchronous wrapper around _aingest_stream.
+        
+        Args:
+            source: Path to the PDF file, or its content as bytes
+            metadata: Document metadata, filled in with total_pages and
+                extraction_method as the PDF is read
+            
+        Returns:
+            Number of chunks stored
+        """
+        async def run() -> int:
+            try:
+                return await self._aingest_stream(source, metadata)
+            finally:
+                # The event loop ends with this call, so its OpenAI client can't
+                # be reused (EndeeClient's pool lives on its own loop)
+                await self.embedding_service.aclose()
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(run())
+        
+        # Called from inside an event loop: run on a separate thread's loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run()).result()
+    
+    async def _aingest_stream(self, source, metadata: Dict[str, Any]) -> int:
+        """
+        Async version of _ingest_stream.
+        
+        Each batch is submitted to an InsertRing and stored while the next
+        one is being embedded, so the embedding API and the vector database
+        work at the same time and ingest takes about as long as the slower
+        of the two.
+        
+        Args:
+            source: Path to the PDF file, or its content as bytes
+            metadata: Document metadata, filled in with total_pages and
+                extraction_method as the PDF is read
+            
+        Returns:
+            Number of chunks stored
+        """
+        logger.info("Extracting, chunking and embedding pages...")
+        pages = self.document_processor.iter_pages(source, metadata)
+        chunks = self.document_processor.iter_chunks(pages, metadata)
+        
+        def check(completions: List) -> None:
+            failed = sum(count for count, success in completions if not success)
+            if failed:
+                raise RuntimeError(f"Failed to store {failed} chunks in vector database")
+        
+        # The ring's bounded submission queue limits the memory held by
+        # embedded-but-unstored chunks
+        ring = InsertRing()
+        total_chunks = 0
+        try:
+            async for batch in self.embedding_service.aiter_chunk_batches(chunks):
+                logger.info(f"Storing {len(batch)} chunks in vector database...")
+                await self.vector_store.submit_chunk_batch(ring, batch)
+                total_chunks += len(batch)
+                check(ring.reap_ready())
+            
+            check(await ring.drain())
+        finally:
+            await ring.aclose()
+        
+        if not total_chunks:
+            raise ValueError("No text content extracted from PDF")
+        
+        # New chunks can change the results of any cached search
+        self.query_cache.clear()
+        
+        logger.info(f"Split document into {total_chunks} chunks")
+        return total_chunks
+    
     def search_documents(self, query: str, top_k: int = 5, threshold: float = 0.0) -> List[Dict[str, Any]]:
         """
         Search for relevant document chunks based on a query.
@@ -226,12 +295,110 @@ class RAGPipeline:
             logger.info(f"Searching documents for query: '{query[:100]}...'")
             
             # Generate embedding for the query
-            query_embedding = self.embedding_service.generate_embedding(query)
+            query_embedding = self.embedding_service.embed_query(query)
+            
+            cached = self.query_cache.get(query_embedding, (top_k, threshold))
+            if cached is not None:
+                logger.info(f"Reusing {len(cached)} cached results for a similar query")
+                return cached
             
             # Search similar chunks
             results = self.vector_store.search_similar_chunks(
                 query_embedding, top_k, threshold
             )
+            if results:
+                self.query_cache.put(query_embedding, results, (top_k, threshold))
+            
+            logger.info(f"Found {len(results)} relevant chunks")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Failed to search documents: {e}")
+            return []
+    
+    def search_documents_batch(self, queries: List[str], top_k: int = 5,
+                               threshold: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """
+        Search for relevant document chunks for many queries at once.
+
+        All query embeddings are generated together and the queries without
+        cached results are sent to the vector database in one request.
+
+        Args:
+            queries: Search query texts
+            top_k: Number of top results to return per query
+            threshold: Minimum similarity threshold
+
+        Returns:
+            One list of relevant document chunks per query, in query order
+        """
+        if not self.initialized:
+            raise RuntimeError("RAG pipeline not initialized. Call initialize() first.")
+
+        try:
+            logger.info(f"Searching documents for {len(queries)} queries")
+
+            query_embeddings = self.embedding_service.embed_queries(queries)
+
+            results = [self.query_cache.get(embedding, (top_k, threshold))
+                       for embedding in query_embeddings]
+            missing = [i for i, cached in enumerate(results) if cached is None]
+
+            if missing:
+                found = self.vector_store.search_similar_chunks_batch(
+                    query_embeddings[missing], top_k, threshold
+                )
+                if len(found) != len(missing):
+                    logger.error(f"Batch search returned {len(found)} result lists for {len(missing)} queries")
+                    found = [[] for _ in missing]
+
+                for i, query_results in zip(missing, found):
+                    results[i] = query_results
+                    if query_results:
+                        self.query_cache.put(query_embeddings[i], query_results, (top_k, threshold))
+
+            logger.info(f"Found relevant chunks for {sum(1 for r in results if r)} of {len(queries)} queries")
+            return results
+
+        except Exception as e:
+            logger.error(f"Failed to search documents: {e}")
+            return [[] for _ in queries]
+
+    async def asearch_documents(self, query: str, top_k: int = 5, threshold: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Async version of search_documents.
+        
+        Independent queries can be awaited together (e.g. with asyncio.gather)
+        so their embedding and vector search round-trips overlap.
+        
+        Args:
+            query: Search query text
+            top_k: Number of top results to return
+            threshold: Minimum similarity threshold
+            
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        if not self.initialized:
+            raise RuntimeError("RAG pipeline not initialized. Call initialize() first.")
+        
+        try:
+            logger.info(f"Searching documents for query: '{query[:100]}...'")
+            
+            # Generate embedding for the query
+            query_embedding = await self.embedding_service.embed_query_async(query)
+            
+            cached = self.query_cache.get(query_embedding, (top_k, threshold))
+            if cached is not None:
+                logger.info(f"Reusing {len(cached)} cached results for a similar query")
+                return cached
+            
+            # Search similar chunks
+            results = await self.vector_store.asearch_similar_chunks(
+                query_embedding, top_k, threshold
+            )
+            if results:
+                self.query_cache.put(query_embedding, results, (top_k, threshold))
             
             logger.info(f"Found {len(results)} relevant chunks")
             return results
@@ -253,10 +420,10 @@ class RAGPipeline:
             status = {
                 "initialized": self.initialized,
                 "endee_healthy": endee_healthy,
-                "endee_url": settings.endee_url,
-                "embedding_model": settings.openai_model,
-                "chunk_size": settings.chunk_size,
-                "chunk_overlap": settings.chunk_overlap,
+                "endee_url": self.settings.endee_url,
+                "embedding_model": self.settings.openai_model,
+                "chunk_size": self.settings.chunk_size,
+                "chunk_overlap": self.settings.chunk_overlap,
                 "collection_name": self.vector_store.collection_name
             }
             
@@ -274,7 +441,30 @@ class RAGPipeline:
             }
 
 
-# Convenience functions for direct usage
+# Convenience functions for direct usage, sharing one initialized pipeline
+_pipeline: Optional[RAGPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> Optional[RAGPipeline]:
+    """
+    Get the shared pipeline, creating and initializing it on first use.
+    
+    Returns:
+        The initialized pipeline, or None if initialization failed (it is
+        retried on the next call)
+    """
+    global _pipeline
+    
+    with _pipeline_lock:
+        if _pipeline is None:
+            pipeline = RAGPipeline()
+            if not pipeline.initialize():
+                return None
+            _pipeline = pipeline
+        return _pipeline
+
+
 def process_pdf_file(file_path: str) -> Dict[str, Any]:
     """
     Convenience function to process a PDF file.
@@ -285,9 +475,9 @@ def process_pdf_file(file_path: str) -> Dict[str, Any]:
     Returns:
         Processing results
     """
-    pipeline = RAGPipeline()
+    pipeline = _get_pipeline()
     
-    if not pipeline.initialize():
+    if pipeline is None:
         return {
             "success": False,
             "error": "Failed to initialize RAG pipeline"
@@ -307,9 +497,9 @@ def search_documents(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
     Returns:
         Search results
     """
-    pipeline = RAGPipeline()
+    pipeline = _get_pipeline()
     
-    if not pipeline.initialize():
+    if pipeline is None:
         return []
     
-    return pipeline.search_documents(query, top_k)
\ No newline at end of file
+    return pipeline.search_documents(query, top_k)
@@ -1,9 +1,28 @@
 """Basic test script to verify the setup without heavy dependencies."""
 
+import functools
 import os
+import socket
 import sys
 from pathlib import Path
 
+@functools.lru_cache(maxsize=1)
+def _load_env_keys(env_path=".env"):
+    """Parse the variable names defined in a .env file, once."""
+    return frozenset(
+        line.split("=", 1)[0].strip()
+        for line in Path(env_path).read_text().splitlines()
+        if "=" in line and not line.lstrip().startswith("#")
+    )
+
+def _dir_entries(path):
+    """Names in a directory, read with one scandir instead of a stat per file."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
 def test_environment():
     """Test basic environment setup."""
     print("🔍 Testing Environment Setup")
@@ -12,18 +31,18 @@ def test_environment():
     # Check Python version
     print(f"🐍 Python version: {sys.version}")
     
+    root_entries = _dir_entries(".")
+    
     # Check if .env file exists
-    env_file = Path(".env")
-    if env_file.exists():
+    if ".env" in root_entries:
         print("✅ .env file exists")
         
-        # Check for required environment variables
-        with open(".env", "r") as f:
-            content = f.read()
-            
+        # Check for required environment variables; matching whole names
+        # means e.g. OPENAI_API_KEY_BACKUP doesn't count as OPENAI_API_KEY
+        env_keys = _load_env_keys()
         required_vars = ["OPENAI_API_KEY", "ENDEE_URL"]
         for var in required_vars:
-            if var in content:
+            if var in env_keys:
                 print(f"✅ {var} found in .env")
             else:
                 print(f"⚠️  {var} not found in .env")
@@ -32,24 +51,24 @@ def test_environment():
     
     # Check project structure
     print("\n📁 Project Structure:")
-    src_dir = Path("src")
-    if src_dir.exists():
+    if "src" in root_entries:
         print("✅ src/ directory exists")
+        src_entries = _dir_entries("src")
         
         expected_files = [
-            "src/__init__.py",
-            "src/config.py", 
-            "src/document_processor.py",
-            "src/embedding_service.py",
-            "src/endee_client.py",
-            "src/rag_pipeline.py"
+            "__init__.py",
+            "config.py", 
+            "document_processor.py",
+            "embedding_service.py",
+            "endee_client.py",
+            "rag_pipeline.py"
         ]
         
-        for file_path in expected_files:
-            if Path(file_path).exists():
-                print(f"✅ {file_path}")
+        for file_name in expected_files:
+            if file_name in src_entries:
+                print(f"✅ src/{file_name}")
             else:
-                print(f"❌ {file_path}")
+                print(f"❌ src/{file_name}")
     else:
         print("❌ src/ directory not found")
     
@@ -57,7 +76,7 @@ def test_environment():
     docker_files = ["docker-compose.yml", "Dockerfile", "requirements.txt"]
     print("\n🐳 Docker Files:")
     for file_path in docker_files:
-        if Path(file_path).exists():
+        if file_path in root_entries:
             print(f"✅ {file_path}")
         else:
             print(f"❌ {file_path}")
@@ -77,13 +96,25 @@ def test_imports():
         except ImportError as e:
             print(f"❌ {module}: {e}")
 
-def test_endee_connection():
+def test_endee_connection(deep=False):
     """Test connection to Endee (if running)."""
     print("\n🔗 Testing Endee Connection:")
     
+    # A TCP connect is enough to tell whether Endee is listening; the
+    # health endpoint is only requested for a deep check
+    try:
+        with socket.create_connection(("localhost", 8080), timeout=0.5):
+            print("✅ Endee port is open")
+    except OSError as e:
+        print(f"❌ Cannot connect to Endee: {e}")
+        print("   Make sure to run: docker-compose up endee")
+        return
+    
+    if not deep:
+        return
+    
     try:
         import urllib.request
-        import json
         
         # Try to connect to Endee health endpoint
         url = "http://localhost:8080/health"
@@ -95,8 +126,7 @@ def test_endee_connection():
                 else:
                     print(f"⚠️  Endee responded with status: {response.status}")
         except Exception as e:
-            print(f"❌ Cannot connect to Endee: {e}")
-            print("   Make sure to run: docker-compose up endee")
+            print(f"❌ Endee health check failed: {e}")
             
     except ImportError:
         print("❌ Cannot test connection (urllib not available)")
@@ -108,7 +138,7 @@ def main():
     
     test_environment()
     test_imports()
-    test_endee_connection()
+    test_endee_connection(deep="--deep" in sys.argv)
     
     print("\n" + "=" * 50)
     print("📋 Next Steps:")
@@ -0,0 +1,243 @@
+"""Unit tests for embedding and Endee client helpers that need no services."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+import pytest
+
+from src.embedding_service import EmbeddingService, SemanticCache
+from src.endee_client import InsertRing, quantize_int8
+
+
+def _service(**kwargs):
+    """An EmbeddingService that never touches the network or disk."""
+    return EmbeddingService(api_key="test", cache_path=None, **kwargs)
+
+
+def _unit_rows(count, dimension=64, seed=0):
+    rows = np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+    return rows / np.linalg.norm(rows, axis=1, keepdims=True)
+
+
+# Quantization
+
+def test_int8_round_trip_error_bound():
+    service = _service(quantization="int8")
+    embeddings = _unit_rows(16)
+    
+    quantized, scales = service.quantize_batch(embeddings)
+    assert quantized.dtype == np.int8
+    for row, q, scale in zip(embeddings, quantized, scales):
+        # Rounding moves each component by at most half a step
+        restored = service.dequantize(q, scale)
+        assert np.abs(restored - row).max() <= scale / 2 + 1e-6
+        
+        single, single_scale = service.quantize(row)
+        np.testing.assert_array_equal(single, q)
+        assert single_scale == pytest.approx(scale)
+
+
+def test_int8_zero_vector_round_trips():
+    service = _service(quantization="int8")
+    quantized, scale = service.quantize(np.zeros(8, dtype=np.float32))
+    assert not quantized.any()
+    assert not service.dequantize(quantized, scale).any()
+
+
+def test_wire_int8_round_trip_error_bound():
+    vectors = np.concatenate([_unit_rows(16), np.zeros((1, 64), dtype=np.float32)])
+    
+    quantized, scales, zero_points = quantize_int8(vectors)
+    restored = (quantized.astype(np.float32) - zero_points[:, None]) * scales[:, None]
+    
+    assert quantized.dtype == np.int8
+    assert (np.abs(restored - vectors).max(axis=1) <= scales / 2 + 1e-6).all()
+    assert not restored[-1].any()
+
+
+# Query keys
+
+def test_query_key_normalizes_case_and_spacing():
+    key = EmbeddingService._query_key
+    assert key("  What IS\tRAG?\n") == key("what is rag?")
+    assert key("C++") != key("C") != key("C#")
+
+
+def test_query_cache_reinsert_refreshes_lru_position():
+    service = _service(cache_size=2)
+    first, second, third = _unit_rows(3)
+    service._store_query_local("first", first)
+    service._store_query_local("second", second)
+    service._store_query_local("first", first)
+    service._store_query_local("third", third)
+    
+    assert service._get_query_embedding("first") is first
+    assert service._get_query_embedding("second") is None
+
+
+# Semantic cache
+
+def test_semantic_cache_hit_and_miss():
+    cache = SemanticCache(threshold=0.95, capacity=4)
+    first, other = _unit_rows(2)
+    cache.put(first, [{"id": "a"}])
+    
+    assert cache.get(first * 3) == [{"id": "a"}]
+    assert cache.get(first + 0.01 * other) == [{"id": "a"}]
+    assert cache.get(other) is None
+
+
+def test_semantic_cache_params_must_match():
+    cache = SemanticCache(threshold=0.95, capacity=4)
+    (embedding,) = _unit_rows(1)
+    cache.put(embedding, [{"id": "a"}], params=(5, 0.5))
+    
+    assert cache.get(embedding, params=(5, 0.5)) == [{"id": "a"}]
+    assert cache.get(embedding, params=(10, 0.5)) is None
+    assert cache.get(embedding) is None
+
+
+def test_semantic_cache_returns_copies():
+    cache = SemanticCache(threshold=0.95, capacity=4)
+    (embedding,) = _unit_rows(1)
+    value = [{"id": "a"}]
+    cache.put(embedding, value)
+    value[0]["id"] = "changed"
+    
+    hit = cache.get(embedding)
+    hit[0]["id"] = "changed again"
+    assert cache.get(embedding) == [{"id": "a"}]
+
+
+def test_semantic_cache_evicts_least_recently_used():
+    cache = SemanticCache(threshold=0.95, capacity=2)
+    first, second, third = _unit_rows(3)
+    cache.put(first, [{"id": "first"}])
+    cache.put(second, [{"id": "second"}])
+    
+    # Using the first entry makes the second one the eviction candidate
+    assert cache.get(first) == [{"id": "first"}]
+    cache.put(third, [{"id": "third"}])
+    
+    assert cache.get(first) == [{"id": "first"}]
+    assert cache.get(second) is None
+    assert cache.get(third) == [{"id": "third"}]
+
+
+def test_semantic_cache_disabled_with_zero_capacity():
+    cache = SemanticCache(capacity=0)
+    (embedding,) = _unit_rows(1)
+    cache.put(embedding, [{"id": "a"}])
+    assert cache.get(embedding) is None
+
+
+# Batch embedding
+
+def test_embed_missing_splits_failed_batches_and_places_rows_by_index():
+    service = _service()
+    texts = [f"text {i}" for i in range(5)]
+    requests = []
+    
+    def create_embeddings(batch):
+        requests.append(list(batch))
+        if len(batch) > 2 or "text 4" in batch:
+            raise RuntimeError("request too large")
+        # Return the items in reverse order; their index says where they go
+        data = [SimpleNamespace(index=i, embedding=[float(texts.index(t))] * 3)
+                for i, t in enumerate(batch)]
+        return SimpleNamespace(data=data[::-1])
+    
+    service._create_embeddings = create_embeddings
+    embeddings = service._embed_missing(texts)
+    
+    assert requests[0] == texts
+    assert sorted(embeddings) == texts[:4]
+    for text, embedding in embeddings.items():
+        np.testing.assert_array_equal(embedding, [float(texts.index(text))] * 3)
+    
+    # Embedded texts are cached; the one that failed alone is not
+    assert service._get_cached_embeddings(texts).keys() == embeddings.keys()
+
+
+def test_embed_missing_rejects_responses_with_bad_indices():
+    service = _service()
+    texts = ["alpha", "beta"]
+    
+    def create_embeddings(batch):
+        # Duplicate or out-of-range indices would leave rows unwritten
+        data = [SimpleNamespace(index=1, embedding=[1.0, 2.0]) for _ in batch]
+        return SimpleNamespace(data=data)
+    
+    service._create_embeddings = create_embeddings
+    assert service._embed_missing(texts) == {}
+    assert service._get_cached_embeddings(texts) == {}
+
+
+def test_persisted_embeddings_match_the_memory_cache(tmp_path):
+    service = EmbeddingService(api_key="test", cache_path=str(tmp_path / "cache.sqlite"))
+    (embedding,) = _unit_rows(1)
+    service._cache_embeddings({"text": service._freeze(embedding)})
+    
+    restarted = EmbeddingService(api_key="test", cache_path=str(tmp_path / "cache.sqlite"))
+    np.testing.assert_array_equal(restarted._get_cached_embedding("text"), embedding)
+
+
+def test_fatal_embedding_errors_are_not_turned_into_zero_vectors():
+    service = _service()
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    error = openai.AuthenticationError(
+        "invalid api key", response=httpx.Response(401, request=request), body=None
+    )
+    
+    def create_embeddings(batch):
+        raise error
+    
+    service._create_embeddings = create_embeddings
+    with pytest.raises(openai.AuthenticationError):
+        service._process_batch(["some text"])
+
+
+# Insert ring
+
+def test_insert_ring_completes_every_insert_with_its_tag():
+    async def insert(delay, ok=True):
+        await asyncio.sleep(delay)
+        return ok
+    
+    async def run():
+        ring = InsertRing(max_batch=4, max_pending=2)
+        delays = [0.03, 0.01, 0.02, 0.0, 0.01]
+        for tag, delay in enumerate(delays):
+            await ring.submit(insert(delay, ok=tag != 2), tag=tag)
+        completions = await ring.drain()
+        await ring.aclose()
+        return ring, completions
+    
+    ring, completions = asyncio.run(run())
+    assert sorted(tag for tag, _ in completions) == [0, 1, 2, 3, 4]
+    assert dict(completions) == {0: True, 1: True, 2: False, 3: True, 4: True}
+    assert ring.submitted == ring.reaped == 5
+
+
+def test_insert_ring_reports_failed_inserts():
+    async def failing():
+        raise ConnectionError("endee unavailable")
+    
+    async def succeeding():
+        return True
+    
+    async def run():
+        ring = InsertRing()
+        await ring.submit(failing(), tag="bad")
+        await ring.submit(succeeding(), tag="good")
+        completions = await ring.drain()
+        # The worker keeps going after a failure
+        await ring.submit(succeeding(), tag="after")
+        completions += await ring.reap()
+        await ring.aclose()
+        return completions
+    
+    assert dict(asyncio.run(run())) == {"bad": False, "good": True, "after": True}
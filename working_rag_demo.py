@@ -3,44 +3,71 @@
 import json
 import os
 import hashlib
+from collections import OrderedDict
 from typing import List, Dict, Any
 from pathlib import Path
+import numpy as np
 
 class SimulatedEmbeddingService:
     """Simulated embedding service for demonstration."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
         self.model = "simulated-embeddings"
         self.dimension = 384
+        self._scale = np.float32(1.0 / 255.0)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+    
+    def generate_embedding(self, text: str) -> np.ndarray:
+        """
+        Generate a deterministic embedding based on text content.
+        
+        Embeddings of recent texts (such as repeated questions) come from
+        an LRU cache. They are shared, so the returned array is read-only.
+        """
+        embedding = self._cache.get(text)
+        if embedding is not None:
+            self._cache.move_to_end(text)
+            return embedding
+        
+        # One hash byte per dimension, scaled to 0-1
+        embedding = np.frombuffer(self._digest(text), dtype=np.uint8).astype(np.float32) * self._scale
+        embedding.flags.writeable = False
+        
+        if self.cache_size > 0:
+            self._cache[text] = embedding
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return embedding
+    
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for several texts as one (n, dimension) array."""
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            embeddings[i] = np.frombuffer(self._digest(text), dtype=np.uint8)
+        
+        # Scale the whole block at once rather than row by row
+        embeddings *= self._scale
+        return embeddings
     
-    def generate_embedding(self, text: str) -> List[float]:
-        """Generate a deterministic embedding based on text content."""
-        # Create a hash-based embedding for consistency
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        
-        # Convert hash to numbers and normalize
-        embedding = []
-        for i in range(0, len(text_hash), 2):
-            hex_pair = text_hash[i:i+2]
-            value = int(hex_pair, 16) / 255.0  # Normalize to 0-1
-            embedding.append(value)
-        
-        # Pad or truncate to desired dimension
-        while len(embedding) < self.dimension:
-            embedding.extend(embedding[:min(len(embedding), self.dimension - len(embedding))])
-        
-        return embedding[:self.dimension]
+    def _digest(self, text: str) -> bytes:
+        """Hash text to one byte per embedding dimension."""
+        # SHAKE-256 produces digests of any length in a single pass, where
+        # fixed-size hashes (BLAKE2b, xxh3) would need several calls
+        return hashlib.shake_256(text.encode("utf-8")).digest(self.dimension)
     
-    def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+    def cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors."""
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = sum(a * a for a in vec1) ** 0.5
-        magnitude2 = sum(b * b for b in vec2) ** 0.5
+        # SimulatedVectorStore.search doesn't call this: it keeps stored
+        # vectors normalized, so similarity there is a plain dot product
+        magnitude1 = np.linalg.norm(vec1)
+        magnitude2 = np.linalg.norm(vec2)
         
         if magnitude1 == 0 or magnitude2 == 0:
             return 0.0
         
-        return dot_product / (magnitude1 * magnitude2)
+        return float(np.dot(vec1, vec2) / (magnitude1 * magnitude2))
 
 class SimulatedVectorStore:
     """Simulated vector store for demonstration."""
@@ -48,42 +75,74 @@ class SimulatedVectorStore:
     def __init__(self):
         self.vectors = []
         self.embedding_service = SimulatedEmbeddingService()
+        # One L2-normalized row per stored vector, so cosine similarity
+        # against every vector is a single matrix-vector product
+        self._matrix = np.empty((0, self.embedding_service.dimension), dtype=np.float32)
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows in place, leaving zero rows as they are."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        return vectors
     
     def store_chunks(self, chunks: List[Dict[str, Any]]) -> bool:
         """Store document chunks with embeddings."""
+        missing = [chunk for chunk in chunks if "embedding" not in chunk]
+        if missing:
+            generated = self.embedding_service.generate_embeddings_batch(
+                [chunk["text"] for chunk in missing]
+            )
+            for chunk, embedding in zip(missing, generated):
+                chunk["embedding"] = embedding
+        
+        # Embeddings live only in the matrix; each entry keeps what a
+        # search result needs
         for chunk in chunks:
-            if "embedding" not in chunk:
-                chunk["embedding"] = self.embedding_service.generate_embedding(chunk["text"])
-            
             self.vectors.append({
                 "id": chunk.get("chunk_id", len(self.vectors)),
                 "text": chunk["text"],
-                "embedding": chunk["embedding"],
                 "metadata": chunk.get("metadata", {})
             })
         
+        if chunks:
+            # The chunks keep their unnormalized embeddings, so normalize a copy
+            if len(missing) == len(chunks):
+                embeddings = generated.copy()
+            else:
+                embeddings = np.asarray([chunk["embedding"] for chunk in chunks], dtype=np.float32)
+            self._matrix = np.vstack([self._matrix, self._normalize(embeddings)])
+        
         print(f"✅ Stored {len(chunks)} chunks (total: {len(self.vectors)})")
         return True
     
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Search for similar chunks."""
-        query_embedding = self.embedding_service.generate_embedding(query)
-        
-        results = []
-        for vector in self.vectors:
-            similarity = self.embedding_service.cosine_similarity(
-                query_embedding, vector["embedding"]
-            )
-            
-            results.append({
-                "text": vector["text"],
-                "similarity": similarity,
-                "metadata": vector["metadata"]
-            })
-        
-        # Sort by similarity and return top_k
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        return results[:top_k]
+        if not self.vectors or top_k <= 0:
+            return []
+        
+        # Copied, since it's normalized in place
+        query_embedding = np.array(
+            self.embedding_service.generate_embedding(query), dtype=np.float32
+        )
+        scores = self._matrix @ self._normalize(query_embedding)
+        
+        # Select the top_k unordered, then sort only those
+        if top_k < len(scores):
+            top = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        
+        return [
+            {
+                "text": self.vectors[i]["text"],
+                "similarity": float(scores[i]),
+                "metadata": self.vectors[i]["metadata"]
+            }
+            for i in top
+        ]
 
 class DocumentProcessor:
     """Simple document processor."""
@@ -93,43 +152,45 @@ class DocumentProcessor:
     
     def process_text(self, text: str, source: str = "document.txt") -> List[Dict[str, Any]]:
         """Process text into chunks."""
-        # Simple sentence-based chunking
-        sentences = [s.strip() + "." for s in text.split('.') if s.strip()]
-        
+        # Simple sentence-based chunking in one pass: sentences are collected
+        # per chunk and joined once, rather than by repeated string +=
         chunks = []
-        current_chunk = ""
-        chunk_id = 0
-        
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) <= self.chunk_size:
-                current_chunk += " " + sentence if current_chunk else sentence
-            else:
-                if current_chunk:
-                    chunks.append({
-                        "chunk_id": chunk_id,
-                        "text": current_chunk.strip(),
-                        "metadata": {
-                            "source": source,
-                            "chunk_index": chunk_id,
-                            "word_count": len(current_chunk.split())
-                        }
-                    })
-                    chunk_id += 1
-                current_chunk = sentence
+        sentences = []
+        length = 0
+        
+        for sentence in text.split("."):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            sentence += "."
+            
+            if length + len(sentence) > self.chunk_size and sentences:
+                chunks.append(self._make_chunk(" ".join(sentences), len(chunks), source))
+                sentences = []
+                length = 0
+            
+            # Joined sentences are separated by a single space
+            length += len(sentence) + (1 if sentences else 0)
+            sentences.append(sentence)
         
         # Add the last chunk
-        if current_chunk:
-            chunks.append({
-                "chunk_id": chunk_id,
-                "text": current_chunk.strip(),
-                "metadata": {
-                    "source": source,
-                    "chunk_index": chunk_id,
-                    "word_count": len(current_chunk.split())
-                }
-            })
+        if sentences:
+            chunks.append(self._make_chunk(" ".join(sentences), len(chunks), source))
         
         return chunks
+    
+    @staticmethod
+    def _make_chunk(text: str, chunk_id: int, source: str) -> Dict[str, Any]:
+        """Build a chunk dictionary for a piece of text."""
+        return {
+            "chunk_id": chunk_id,
+            "text": text,
+            "metadata": {
+                "source": source,
+                "chunk_index": chunk_id,
+                "word_count": len(text.split())
+            }
+        }
 
 class RAGSystem:
     """Complete RAG system demonstration."""
@@ -172,11 +233,16 @@ class RAGSystem:
                 "confidence": 0.0
             }
         
-        # Generate answer based on top results
+        # Generate answer based on top results, which only shows the first
+        # 300 characters of context, so stop collecting once they're covered
         context_chunks = []
+        context_length = -1
         for result in results:
             if result["similarity"] > 0.1:  # Minimum similarity threshold
                 context_chunks.append(result["text"])
+                context_length += len(result["text"]) + 1
+                if context_length >= 300:
+                    break
         
         if not context_chunks:
             answer = "I couldn't find relevant information to answer that question."
@@ -185,7 +251,8 @@ class RAGSystem:
             # Simple answer generation (in real implementation, this would use an LLM)
             context = " ".join(context_chunks)
             answer = f"Based on the available information: {context[:300]}..."
-            confidence = max(r["similarity"] for r in results)
+            # Search returns results best first
+            confidence = results[0]["similarity"]
         
         return {
             "question": question,